@@ -18,7 +18,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.profiling.ProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "core.compression.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -67,6 +69,34 @@ STATIC_URL = "static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 STATICFILES_DIRS = [BASE_DIR / "static"]
 
+# Token buckets for login/signup/checkout: "memory" keeps them per worker,
+# "cache" shares them through the RATE_LIMIT_CACHE alias (use Redis/Memcached).
+RATE_LIMIT_ENABLED = os.getenv("DJANGO_RATE_LIMIT_ENABLED", "True").lower() in {"1", "true", "yes"}
+RATE_LIMIT_BACKEND = os.getenv("DJANGO_RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_CACHE = "default"
+
+# Responses smaller than this are sent uncompressed (brotli is used when installed).
+COMPRESSION_MIN_SIZE = 1024
+# Public item listings are cached, precompressed, per catalogue version. With
+# several workers point the default cache at a shared backend so that version
+# bumps are seen everywhere.
+LISTING_CACHE_TIMEOUT = 300
+
+# Requests sending X-Profile-Token: <PROFILING_SECRET> are sampled and written to
+# PROFILING_DIR; summarise them with `python manage.py aggregate_profiles`.
+PROFILING_ENABLED = os.getenv("DJANGO_PROFILING_ENABLED", "False").lower() in {"1", "true", "yes"}
+PROFILING_SECRET = os.getenv("DJANGO_PROFILING_SECRET", "")
+PROFILING_DIR = Path(os.getenv("DJANGO_PROFILING_DIR", str(BASE_DIR / "profiles")))
+PROFILING_INTERVAL = 0.001
+
+# Stored Idempotency-Key responses for checkout and item creation; expired rows
+# are removed by `python manage.py purge_idempotency_keys`.
+IDEMPOTENCY_KEY_TTL = 24 * 3600
+# A key whose first request has not finished after this many seconds can be
+# reclaimed by a retry. Keep it well above the worker/request timeout; a
+# first attempt that is still running when its key is reclaimed rolls back.
+IDEMPOTENCY_LOCK_TIMEOUT = 600
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 CSRF_TRUSTED_ORIGINS = [
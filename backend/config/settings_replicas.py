@@ -0,0 +1,42 @@
+"""Settings profile that routes read-only views to SQLite read replicas.
+
+Replica files default to ``db_replica.sqlite3`` next to the primary and can be
+overridden with a comma separated ``DJANGO_REPLICA_DB_NAMES``. Locally the
+replicas are refreshed from the primary with ``python manage.py sync_replicas``.
+
+Under test every alias gets its own SQLite file, so replica lag is real and
+``python manage.py test core --settings=config.settings_replicas`` can check
+stale reads and read-your-writes stickiness.
+"""
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR, DATABASES, MIDDLEWARE
+
+_replica_names = [
+    name.strip()
+    for name in os.getenv("DJANGO_REPLICA_DB_NAMES", str(BASE_DIR / "db_replica.sqlite3")).split(",")
+    if name.strip()
+]
+
+DATABASES["default"]["TEST"] = {"NAME": str(BASE_DIR / "test_db.sqlite3")}
+
+DATABASE_REPLICAS: list[str] = []
+for index, name in enumerate(_replica_names, start=1):
+    alias = f"replica{index}"
+    DATABASES[alias] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": name,
+        "TEST": {"NAME": str(BASE_DIR / f"test_db_{alias}.sqlite3")},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["core.routers.PrimaryReplicaRouter"]
+
+# Seconds a session keeps reading from the primary after it wrote something.
+REPLICA_STICKY_SECONDS = int(os.getenv("DJANGO_REPLICA_STICKY_SECONDS", "5"))
+
+MIDDLEWARE = [
+    *MIDDLEWARE,
+    "core.middleware.ReplicaRoutingMiddleware",
+]
@@ -1,9 +1,13 @@
-from django.contrib import admin
+from django.apps import apps
 from django.urls import include, path
 from core import views as core_views
 
 urlpatterns = [
-    path("admin/", admin.site.urls),
     path("", core_views.landing, name="landing"),
     path("api/", include("core.urls")),
 ]
+
+if apps.is_installed("django.contrib.admin"):
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path("admin/", admin.site.urls))
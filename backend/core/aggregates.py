@@ -0,0 +1,123 @@
+from collections import defaultdict
+from decimal import Decimal
+from typing import Iterable
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DecimalField, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .models import CartItem, CartSummary, Item, SellerStats, STATUS_AVAILABLE, STATUS_SOLD
+
+
+# Every function below must run inside the transaction that made the change,
+# so the totals commit or roll back together with the rows they describe.
+
+ZERO = Decimal("0.00")
+
+
+def recount_seller(user_id: int) -> dict:
+    return Item.objects.filter(owner_id=user_id).aggregate(
+        items_on_sale=Count("id", filter=Q(status=STATUS_AVAILABLE)),
+        units_sold=Count("id", filter=Q(status=STATUS_SOLD)),
+        revenue=Coalesce(Sum("price", filter=Q(status=STATUS_SOLD)), Value(ZERO)),
+    )
+
+
+def recount_cart(user_id: int) -> dict:
+    return CartItem.objects.filter(user_id=user_id).aggregate(
+        item_count=Count("id"),
+        total=Coalesce(Sum("item__price"), Value(ZERO)),
+    )
+
+
+def _get_or_recount(model, user_id: int, recount):
+    row = model.objects.filter(user_id=user_id).first()
+    if row is not None:
+        return row
+    try:
+        with transaction.atomic():
+            return model.objects.create(user_id=user_id, **recount(user_id))
+    except IntegrityError:
+        return model.objects.get(user_id=user_id)
+
+
+def get_seller_stats(user_id: int) -> SellerStats:
+    return _get_or_recount(SellerStats, user_id, recount_seller)
+
+
+def get_cart_summary(user_id: int) -> CartSummary:
+    return _get_or_recount(CartSummary, user_id, recount_cart)
+
+
+def create_rows_for_user(user_id: int) -> None:
+    SellerStats.objects.get_or_create(user_id=user_id)
+    CartSummary.objects.get_or_create(user_id=user_id)
+
+
+def record_items_listed(seller_id: int, count: int) -> None:
+    SellerStats.objects.filter(user_id=seller_id).update(items_on_sale=F("items_on_sale") + count)
+
+
+def record_items_removed(items: Iterable[Item]) -> None:
+    """Call before deleting ``items`` with their ``owner_id``, ``status`` and ``price`` loaded."""
+    per_seller: dict[int, list[Item]] = defaultdict(list)
+    for item in items:
+        per_seller[item.owner_id].append(item)
+
+    for seller_id, seller_items in per_seller.items():
+        sold = [item for item in seller_items if item.status == STATUS_SOLD]
+        SellerStats.objects.filter(user_id=seller_id).update(
+            items_on_sale=F("items_on_sale") - (len(seller_items) - len(sold)),
+            units_sold=F("units_sold") - len(sold),
+            revenue=F("revenue") - sum((item.price for item in sold), ZERO),
+        )
+
+
+def record_sale(items: Iterable[Item]) -> None:
+    per_seller: dict[int, list[Item]] = defaultdict(list)
+    for item in items:
+        per_seller[item.owner_id].append(item)
+
+    for seller_id, seller_items in per_seller.items():
+        SellerStats.objects.filter(user_id=seller_id).update(
+            items_on_sale=F("items_on_sale") - len(seller_items),
+            units_sold=F("units_sold") + len(seller_items),
+            revenue=F("revenue") + sum((item.price for item in seller_items), ZERO),
+        )
+
+
+def record_cart_change(user_id: int, count: int, amount: Decimal) -> None:
+    CartSummary.objects.filter(user_id=user_id).update(
+        item_count=F("item_count") + count,
+        total=F("total") + amount,
+    )
+
+
+def cart_users_holding(item_ids: Iterable[int]) -> list[int]:
+    return list(
+        CartItem.objects.filter(item_id__in=list(item_ids)).values_list("user_id", flat=True).distinct()
+    )
+
+
+def refresh_carts(user_ids: Iterable[int]) -> None:
+    """Recompute the summaries of carts whose items were repriced or removed, in one UPDATE."""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    entries = CartItem.objects.filter(user_id=OuterRef("user_id")).values("user_id")
+    CartSummary.objects.filter(user_id__in=user_ids).update(
+        item_count=Coalesce(Subquery(entries.annotate(n=Count("id")).values("n")), Value(0)),
+        total=Coalesce(
+            Subquery(entries.annotate(s=Sum("item__price")).values("s")),
+            Value(ZERO),
+            output_field=DecimalField(max_digits=14, decimal_places=2),
+        ),
+    )
+
+
+def rebuild_all() -> None:
+    """Recount every user's rows, e.g. after the demo data is reseeded."""
+    for user_id in get_user_model().objects.values_list("id", flat=True):
+        SellerStats.objects.update_or_create(user_id=user_id, defaults=recount_seller(user_id))
+        CartSummary.objects.update_or_create(user_id=user_id, defaults=recount_cart(user_id))
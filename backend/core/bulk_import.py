@@ -0,0 +1,114 @@
+import codecs
+import csv
+import json
+from typing import Iterable, Iterator
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .aggregates import record_items_listed
+from .listing_cache import bump_catalogue_version
+from .models import Item
+
+
+IMPORT_FORMATS = ("csv", "ndjson")
+BATCH_SIZE = 1000
+# Rows past this many failures are still counted but not described.
+MAX_REPORTED_ERRORS = 1000
+
+
+def iter_rows(lines: Iterable[bytes], fmt: str) -> Iterator[tuple[int, dict | None, str | None]]:
+    """Yield ``(row_number, row, error)`` one line at a time from a byte stream."""
+    text_lines = codecs.iterdecode(lines, "utf-8")
+
+    if fmt == "csv":
+        for row_number, row in enumerate(csv.DictReader(text_lines), start=1):
+            yield row_number, row, None
+        return
+
+    for row_number, line in enumerate(text_lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield row_number, None, "Invalid JSON"
+            continue
+        if not isinstance(row, dict):
+            yield row_number, None, "Row must be a JSON object"
+            continue
+        yield row_number, row, None
+
+
+def _build_item(owner, row: dict) -> Item:
+    title = row.get("title") or ""
+    description = row.get("description") or ""
+    if not isinstance(title, str) or not isinstance(description, str):
+        raise ValidationError("title and description must be strings")
+    title = title.strip()
+    price_raw = row.get("price")
+    if not title or price_raw in (None, ""):
+        raise ValidationError("title and price are required")
+
+    name_field = Item._meta.get_field("name")
+    price_field = Item._meta.get_field("price")
+    try:
+        price = price_field.clean(str(price_raw).strip(), None)
+    except ValidationError:
+        raise ValidationError("price must be a number with at most 2 decimal places") from None
+    name_field.clean(title, None)
+
+    return Item(
+        owner=owner,
+        name=title,
+        description=description.strip(),
+        price=price,
+    )
+
+
+def import_items(owner, lines: Iterable[bytes], fmt: str, *, batch_size: int = BATCH_SIZE) -> dict:
+    """Validate rows as they stream in and insert the valid ones in batches.
+
+    Each batch is committed on its own, so a failing row never discards the
+    rows around it; the report lists the rows that were skipped.
+    """
+    created = 0
+    failed = 0
+    errors: list[dict] = []
+    batch: list[Item] = []
+
+    def flush() -> None:
+        nonlocal created
+        if batch:
+            with transaction.atomic():
+                Item.objects.bulk_create(batch)
+                record_items_listed(owner.id, len(batch))
+            created += len(batch)
+            batch.clear()
+
+    try:
+        for row_number, row, error in iter_rows(lines, fmt):
+            if error is None:
+                try:
+                    batch.append(_build_item(owner, row))
+                except ValidationError as exc:
+                    error = "; ".join(exc.messages)
+
+            if error is not None:
+                failed += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({"row": row_number, "message": error})
+
+            if len(batch) >= batch_size:
+                flush()
+    except (UnicodeDecodeError, csv.Error) as exc:
+        flush()
+        errors.append({"row": None, "message": f"Could not read upload: {exc}"})
+        failed += 1
+    else:
+        flush()
+    finally:
+        if created:
+            bump_catalogue_version()
+
+    return {"created": created, "failed": failed, "errors": errors}
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+
+@register("api", Tags.compatibility)
+def check_api_only_profile(app_configs, **kwargs):
+    if not getattr(settings, "API_ONLY", False):
+        return []
+
+    errors = []
+    for app in getattr(settings, "API_ONLY_EXCLUDED_APPS", []):
+        if app in settings.INSTALLED_APPS:
+            errors.append(
+                Error(f"{app} is installed in the API-only profile.", id="core.E001")
+            )
+    for entry in getattr(settings, "API_ONLY_EXCLUDED_MIDDLEWARE", []):
+        if entry in settings.MIDDLEWARE:
+            errors.append(
+                Error(f"{entry} is enabled in the API-only profile.", id="core.E002")
+            )
+    if settings.TEMPLATES:
+        errors.append(
+            Error("TEMPLATES should be empty in the API-only profile.", id="core.E003")
+        )
+    return errors
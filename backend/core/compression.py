@@ -0,0 +1,93 @@
+import functools
+import gzip
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+
+@functools.cache
+def _brotli():
+    """Import brotli on first use so worker startup does not pay for it."""
+    try:
+        import brotli
+    except ImportError:  # brotli is optional, gzip is always available
+        return None
+    return brotli
+
+
+def available_encodings() -> list[str]:
+    return ["br", "gzip"] if _brotli() is not None else ["gzip"]
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Pick the best supported encoding the client accepts, honouring ``q=0``."""
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                continue
+        accepted[name.strip().lower()] = quality
+
+    for encoding in available_encodings():
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str, *, level: int | None = None) -> bytes:
+    if encoding == "br":
+        return _brotli().compress(body, quality=4 if level is None else level)
+    # mtime=0 keeps the output deterministic so cached variants stay byte-identical.
+    return gzip.compress(body, compresslevel=6 if level is None else level, mtime=0)
+
+
+def precompress(body: bytes) -> dict[str, bytes]:
+    """Compress ``body`` with every available encoding at high effort, for caching."""
+    return {encoding: compress(body, encoding, level=9) for encoding in available_encodings()}
+
+
+class CompressionMiddleware:
+    """Compress responses above ``COMPRESSION_MIN_SIZE`` with brotli or gzip.
+
+    Views can attach ``response.precompressed`` (encoding -> bytes) to skip
+    the compression work, e.g. for bodies served from the listing cache.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if response.streaming or response.has_header("Content-Encoding"):
+            return response
+        if len(response.content) < getattr(settings, "COMPRESSION_MIN_SIZE", 1024):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        encoding = choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        precompressed = getattr(response, "precompressed", None) or {}
+        compressed = precompressed.get(encoding)
+        if compressed is None:
+            compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+        response["Content-Encoding"] = encoding
+        # Same as Django's GZipMiddleware: the bytes differ, so the ETag becomes weak.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        return response
@@ -0,0 +1,15 @@
+from django.http import HttpResponse
+
+
+def with_cors(request, response: HttpResponse) -> HttpResponse:
+    origin = request.headers.get("Origin")
+    if origin:
+        response["Access-Control-Allow-Origin"] = origin
+        response["Access-Control-Allow-Credentials"] = "true"
+    else:
+        response["Access-Control-Allow-Origin"] = "*"
+    response["Access-Control-Allow-Headers"] = "Content-Type, If-None-Match, If-Modified-Since, Idempotency-Key"
+    response["Access-Control-Expose-Headers"] = "ETag, Last-Modified, Retry-After, Idempotent-Replayed"
+
+    response["Access-Control-Allow-Methods"] = "GET, POST, PATCH, PUT, DELETE, OPTIONS"
+    return response
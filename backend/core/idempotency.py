@@ -0,0 +1,136 @@
+import hashlib
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+
+from .http import with_cors
+from .models import IdempotencyKey
+
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+def _key_ttl() -> timedelta:
+    return timedelta(seconds=getattr(settings, "IDEMPOTENCY_KEY_TTL", 24 * 3600))
+
+
+def _lock_timeout() -> timedelta:
+    return timedelta(seconds=getattr(settings, "IDEMPOTENCY_LOCK_TIMEOUT", 600))
+
+
+class _KeyReclaimed(Exception):
+    """The key was reclaimed by a retry while this attempt was still running."""
+
+
+def purge_expired_keys() -> int:
+    deleted, _ = IdempotencyKey.objects.filter(created_at__lt=timezone.now() - _key_ttl()).delete()
+    return deleted
+
+
+def _claim(user, endpoint: str, key: str, request_hash: str):
+    """Return ``(record, None)`` when this request owns the key, else ``(None, existing)``."""
+    for _ in range(2):
+        try:
+            with transaction.atomic():
+                record = IdempotencyKey.objects.create(
+                    user=user, endpoint=endpoint, key=key, request_hash=request_hash
+                )
+            return record, None
+        except IntegrityError:
+            existing = IdempotencyKey.objects.filter(user=user, endpoint=endpoint, key=key).first()
+            if existing is None:
+                continue
+
+            age = timezone.now() - existing.created_at
+            expired = age > _key_ttl()
+            abandoned = existing.status_code is None and age > _lock_timeout()
+            if not (expired or abandoned):
+                return None, existing
+            stale = IdempotencyKey.objects.filter(pk=existing.pk, created_at=existing.created_at)
+            if not expired:
+                stale = stale.filter(status_code__isnull=True)
+            stale.delete()
+    return None, None
+
+
+def idempotent(endpoint: str):
+    """Replay the stored response for a repeated ``Idempotency-Key`` POST.
+
+    The first request with a key runs the view and stores its response;
+    repeats with the same body get that response back without running the
+    view again. Server errors and throttled responses are not stored, so the
+    client can retry them with the same key.
+
+    The response is stored in the same transaction as the view's writes. If
+    the worker dies first, both roll back and the key can be reclaimed after
+    ``IDEMPOTENCY_LOCK_TIMEOUT``. An attempt whose key was reclaimed while it
+    was still running finds its row gone and rolls back, so at most one
+    attempt per key ever commits.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped(request, *args, **kwargs):
+            key = request.headers.get(IDEMPOTENCY_HEADER, "").strip()
+            if request.method != "POST" or not key or not request.user.is_authenticated:
+                return view_func(request, *args, **kwargs)
+
+            if len(key) > 255:
+                return with_cors(
+                    request, JsonResponse({"message": "Idempotency-Key is too long"}, status=400)
+                )
+
+            request_hash = hashlib.sha256(request.body).hexdigest()
+            record, existing = _claim(request.user, endpoint, key, request_hash)
+
+            if record is None:
+                if existing is None:
+                    response = JsonResponse({"message": "Could not reserve Idempotency-Key"}, status=409)
+                elif existing.request_hash != request_hash:
+                    response = JsonResponse(
+                        {"message": "Idempotency-Key was already used with a different request"}, status=422
+                    )
+                elif existing.status_code is None:
+                    response = JsonResponse({"message": "Original request is still in progress"}, status=409)
+                    response["Retry-After"] = "1"
+                else:
+                    response = HttpResponse(
+                        existing.response_body,
+                        status=existing.status_code,
+                        content_type=existing.content_type or "application/json",
+                    )
+                    response["Idempotent-Replayed"] = "true"
+                return with_cors(request, response)
+
+            in_progress = IdempotencyKey.objects.filter(pk=record.pk, status_code__isnull=True)
+            try:
+                with transaction.atomic():
+                    response = view_func(request, *args, **kwargs)
+                    if response.status_code >= 500 or response.status_code == 429 or response.streaming:
+                        owned, _ = in_progress.delete()
+                    else:
+                        owned = in_progress.update(
+                            status_code=response.status_code,
+                            content_type=response.get("Content-Type", ""),
+                            response_body=response.content.decode(response.charset or "utf-8"),
+                        )
+                    if not owned:
+                        raise _KeyReclaimed
+            except _KeyReclaimed:
+                response = JsonResponse(
+                    {"message": "Idempotency-Key was taken over by a retry; this attempt was rolled back"},
+                    status=409,
+                )
+                return with_cors(request, response)
+            except Exception:
+                in_progress.delete()
+                raise
+            return response
+
+        return _wrapped
+
+    return decorator
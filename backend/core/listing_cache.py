@@ -0,0 +1,66 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .compression import precompress
+
+
+CATALOGUE_VERSION_KEY = "catalogue:version"
+
+
+def catalogue_version() -> int:
+    version = cache.get(CATALOGUE_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOGUE_VERSION_KEY, 1, timeout=None)
+        version = cache.get(CATALOGUE_VERSION_KEY, 1)
+    return version
+
+
+def _bump() -> None:
+    try:
+        cache.incr(CATALOGUE_VERSION_KEY)
+    except ValueError:
+        cache.add(CATALOGUE_VERSION_KEY, 1, timeout=None)
+
+
+def bump_catalogue_version() -> None:
+    """Invalidate every cached listing once the current transaction commits.
+
+    Bumping earlier would let a concurrent GET store the pre-commit rows
+    under the new version. At most one bump is queued per transaction, so a
+    bulk delete firing ``post_delete`` per row still costs a single ``incr``.
+    The pending callback is looked up in the connection's queue rather than
+    trusted from a flag, so a bump dropped by a rollback is queued again.
+    """
+    connection = transaction.get_connection()
+    pending = getattr(connection, "_catalogue_bump", None)
+    if pending is not None and any(entry[1] is pending for entry in connection.run_on_commit):
+        return
+
+    def bump_once() -> None:
+        connection._catalogue_bump = None
+        _bump()
+
+    connection._catalogue_bump = bump_once
+    transaction.on_commit(bump_once)
+
+
+def listing_cache_key(search_term: str) -> str:
+    """Key for the current catalogue version; take it before querying the rows."""
+    term_digest = hashlib.md5(search_term.encode("utf-8")).hexdigest()
+    return f"listing:{catalogue_version()}:{term_digest}"
+
+
+def get_cached_listing(cache_key: str) -> dict[str, bytes] | None:
+    """Return the cached body variants (``identity`` plus encodings) or None."""
+    return cache.get(cache_key)
+
+
+def cache_listing(cache_key: str, body: bytes) -> dict[str, bytes]:
+    variants = {"identity": body}
+    if len(body) >= getattr(settings, "COMPRESSION_MIN_SIZE", 1024):
+        variants.update(precompress(body))
+    cache.set(cache_key, variants, timeout=getattr(settings, "LISTING_CACHE_TIMEOUT", 300))
+    return variants
@@ -0,0 +1,64 @@
+import json
+import statistics
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Summarise profiles written by ProfilingMiddleware, grouped by endpoint."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dir", default=None, help="Profile directory, defaults to PROFILING_DIR.")
+        parser.add_argument("--top", type=int, default=10, help="Hottest frames to list per endpoint.")
+        parser.add_argument(
+            "--merge-to",
+            default=None,
+            help="Directory to write one merged <endpoint>.collapsed file per endpoint.",
+        )
+
+    def handle(self, *args, **options):
+        profile_dir = Path(options["dir"] or settings.PROFILING_DIR)
+        if not profile_dir.is_dir():
+            raise CommandError(f"{profile_dir} does not exist")
+
+        summaries = defaultdict(list)
+        stacks: dict[str, Counter] = defaultdict(Counter)
+        for summary_path in sorted(profile_dir.glob("*.json")):
+            summary = json.loads(summary_path.read_text())
+            endpoint = summary["endpoint"]
+            summaries[endpoint].append(summary)
+            collapsed_path = profile_dir / summary["collapsed"]
+            if collapsed_path.exists():
+                for line in collapsed_path.read_text().splitlines():
+                    stack, _, count = line.rpartition(" ")
+                    stacks[endpoint][stack] += int(count)
+
+        if not summaries:
+            self.stdout.write("No profiles found.")
+            return
+
+        for endpoint, runs in sorted(summaries.items(), key=lambda entry: -len(entry[1])):
+            wall = [run["wall_ms"] for run in runs]
+            sql = [run["sql_ms"] for run in runs]
+            self.stdout.write(
+                f"{endpoint}: {len(runs)} requests, wall median {statistics.median(wall):.1f} ms "
+                f"(max {max(wall):.1f}), SQL median {statistics.median(sql):.1f} ms"
+            )
+
+            self_samples: Counter[str] = Counter()
+            for stack, count in stacks[endpoint].items():
+                self_samples[stack.rsplit(";", 1)[-1]] += count
+            total = sum(self_samples.values()) or 1
+            for frame, count in self_samples.most_common(options["top"]):
+                self.stdout.write(f"  {count / total:6.1%}  {frame}")
+
+        if options["merge_to"]:
+            merge_dir = Path(options["merge_to"])
+            merge_dir.mkdir(parents=True, exist_ok=True)
+            for endpoint, endpoint_stacks in stacks.items():
+                with open(merge_dir / f"{endpoint.replace(':', '_')}.collapsed", "w") as merged:
+                    for stack, count in endpoint_stacks.items():
+                        merged.write(f"{stack} {count}\n")
@@ -0,0 +1,35 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from core.compression import available_encodings
+
+
+class Command(BaseCommand):
+    help = "Report bytes on the wire and CPU time per request for each content encoding."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Requests per path and encoding.")
+        parser.add_argument("--username", default="testuser1", help="User for the authenticated endpoints.")
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.filter(username=options["username"]).first()
+        if user is None:
+            raise CommandError(f"User {options['username']} not found; seed the demo data first.")
+
+        client = Client()
+        client.force_login(user)
+
+        for path in ("/api/items/", "/api/inventory/", "/api/cart/"):
+            for encoding in ["identity", *available_encodings()]:
+                wire_bytes = 0
+                start = time.process_time()
+                for _ in range(options["requests"]):
+                    response = client.get(path, HTTP_ACCEPT_ENCODING=encoding)
+                    wire_bytes = len(response.content)
+                cpu_per_request = (time.process_time() - start) / options["requests"]
+                self.stdout.write(
+                    f"{path} {encoding}: {wire_bytes} bytes, {cpu_per_request * 1000:.3f} ms CPU/request"
+                )
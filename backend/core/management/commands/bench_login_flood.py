@@ -0,0 +1,89 @@
+import json
+import logging
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import Client, override_settings
+
+from core.ratelimit import reset_bucket_store
+
+
+class Command(BaseCommand):
+    help = "Measure item listing latency while login is flooded, with and without rate limiting."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--flooders", type=int, default=8, help="Threads hammering /api/login/.")
+        parser.add_argument("--requests", type=int, default=200, help="Listing requests to time.")
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0.01,
+            help="Pause between login attempts per flooder, keeps the offered load equal.",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=float,
+            default=3.0,
+            help="Seconds to flood before timing, so the login burst allowance is spent.",
+        )
+
+    def handle(self, *args, **options):
+        logging.getLogger("django.request").setLevel(logging.ERROR)
+        baseline = self._browse_latencies(options["requests"])
+        self._report("idle", baseline)
+
+        for enabled in (False, True):
+            reset_bucket_store()
+            with override_settings(RATE_LIMIT_ENABLED=enabled):
+                stop = threading.Event()
+                counts = {"429": 0, "other": 0}
+                flooders = [
+                    threading.Thread(target=self._flood_login, args=(stop, counts, options["interval"]))
+                    for _ in range(options["flooders"])
+                ]
+                for thread in flooders:
+                    thread.start()
+                time.sleep(options["warmup"])
+                try:
+                    latencies = self._browse_latencies(options["requests"])
+                finally:
+                    stop.set()
+                    for thread in flooders:
+                        thread.join()
+            label = "login flood, rate limit " + ("on" if enabled else "off")
+            self._report(label, latencies, counts)
+        reset_bucket_store()
+
+    def _flood_login(self, stop: threading.Event, counts: dict, interval: float) -> None:
+        client = Client(REMOTE_ADDR="10.0.0.1")
+        body = json.dumps({"username": "testuser1", "password": "wrong"})
+        try:
+            while not stop.is_set():
+                response = client.post("/api/login/", body, content_type="application/json")
+                counts["429" if response.status_code == 429 else "other"] += 1
+                stop.wait(interval)
+        finally:
+            connections.close_all()
+
+    def _browse_latencies(self, requests: int) -> list[float]:
+        client = Client(REMOTE_ADDR="10.0.0.2")
+        latencies = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            client.get("/api/items/")
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    def _report(self, label: str, latencies: list[float], counts: dict | None = None) -> None:
+        latencies = sorted(latencies)
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        line = (
+            f"{label}: median {statistics.median(latencies) * 1000:.2f} ms, "
+            f"p95 {p95 * 1000:.2f} ms"
+        )
+        if counts is not None:
+            line += f" (login responses: {counts['other']} processed, {counts['429']} throttled)"
+        self.stdout.write(line)
@@ -0,0 +1,74 @@
+import json
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+# Runs in a fresh interpreter so every sample pays the full import cost; the
+# cold start covers everything up to the first response being served.
+_PROBE = """
+import io, json, os, sys, time
+start = time.perf_counter()
+os.environ["DJANGO_SETTINGS_MODULE"] = sys.argv[1]
+from config.wsgi import application
+
+environ = {
+    "REQUEST_METHOD": "GET",
+    "PATH_INFO": sys.argv[2],
+    "SERVER_NAME": "localhost",
+    "SERVER_PORT": "80",
+    "wsgi.url_scheme": "http",
+    "wsgi.input": io.BytesIO(),
+    "wsgi.errors": sys.stderr,
+}
+requests = int(sys.argv[3])
+def start_response(status, headers):
+    pass
+b"".join(application(dict(environ), start_response))
+cold_start = time.perf_counter() - start
+
+start = time.perf_counter()
+for _ in range(requests):
+    b"".join(application(dict(environ), start_response))
+per_request = (time.perf_counter() - start) / requests
+print(json.dumps({"cold_start": cold_start, "per_request": per_request}))
+"""
+
+
+class Command(BaseCommand):
+    help = "Compare worker cold-start time and per-request overhead across settings modules."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "modules",
+            nargs="*",
+            default=["config.settings", "config.settings_api"],
+            help="Settings modules to compare.",
+        )
+        parser.add_argument("--runs", type=int, default=5, help="Fresh worker starts per module.")
+        parser.add_argument("--requests", type=int, default=500, help="Requests per worker.")
+        parser.add_argument("--path", default="/api/", help="Path to request; keep it DB-free.")
+
+    def handle(self, *args, **options):
+        for module in options["modules"]:
+            cold_starts: list[float] = []
+            per_request: list[float] = []
+            for _ in range(options["runs"]):
+                output = subprocess.run(
+                    [sys.executable, "-c", _PROBE, module, options["path"], str(options["requests"])],
+                    cwd=settings.BASE_DIR,
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                ).stdout
+                sample = json.loads(output.strip().splitlines()[-1])
+                cold_starts.append(sample["cold_start"])
+                per_request.append(sample["per_request"])
+
+            self.stdout.write(
+                f"{module}: cold start {statistics.median(cold_starts) * 1000:.1f} ms, "
+                f"{statistics.median(per_request) * 1_000_000:.1f} us/request"
+            )
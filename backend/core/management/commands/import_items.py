@@ -0,0 +1,29 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from core.bulk_import import IMPORT_FORMATS, import_items
+
+
+class Command(BaseCommand):
+    help = "Bulk import items for a seller from a CSV or NDJSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("username", help="Seller who will own the imported items.")
+        parser.add_argument("path", help="CSV (title,description,price) or NDJSON file.")
+        parser.add_argument("--format", choices=IMPORT_FORMATS, help="Defaults to the file extension.")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            owner = User.objects.get(username=options["username"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['username']} not found")
+
+        fmt = options["format"] or ("csv" if options["path"].endswith(".csv") else "ndjson")
+
+        with open(options["path"], "rb") as upload:
+            report = import_items(owner, upload, fmt)
+
+        for error in report["errors"]:
+            self.stderr.write(f"row {error['row']}: {error['message']}")
+        self.stdout.write(f"Created {report['created']} items, {report['failed']} rows failed.")
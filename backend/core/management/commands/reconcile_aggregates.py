@@ -0,0 +1,44 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from core.aggregates import recount_cart, recount_seller
+from core.models import CartSummary, SellerStats
+
+
+class Command(BaseCommand):
+    help = "Compare seller stats and cart summaries against a full recount."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fix", action="store_true", help="Overwrite drifted or missing rows.")
+
+    def handle(self, *args, **options):
+        checks = (
+            (SellerStats, recount_seller, ("items_on_sale", "units_sold", "revenue")),
+            (CartSummary, recount_cart, ("item_count", "total")),
+        )
+        rows = {model: {row.user_id: row for row in model.objects.all()} for model, _, _ in checks}
+
+        mismatches = 0
+        for user_id in get_user_model().objects.order_by("id").values_list("id", flat=True):
+            for model, recount, fields in checks:
+                expected = recount(user_id)
+                row = rows[model].get(user_id)
+                if row is None:
+                    drift = "missing"
+                else:
+                    drift = ", ".join(
+                        f"{field} {getattr(row, field)} != {expected[field]}"
+                        for field in fields
+                        if getattr(row, field) != expected[field]
+                    )
+                if not drift:
+                    continue
+
+                mismatches += 1
+                self.stdout.write(f"user {user_id} {model.__name__}: {drift}")
+                if options["fix"]:
+                    model.objects.update_or_create(user_id=user_id, defaults=expected)
+
+        if mismatches and not options["fix"]:
+            raise CommandError(f"{mismatches} aggregate rows out of step; rerun with --fix to repair.")
+        self.stdout.write(f"Checked aggregates, {mismatches} rows {'fixed' if mismatches else 'out of step'}.")
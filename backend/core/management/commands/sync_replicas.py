@@ -0,0 +1,30 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = "Copy the primary SQLite database onto every configured local replica."
+
+    def handle(self, *args, **options):
+        aliases = list(getattr(settings, "DATABASE_REPLICAS", []))
+        if not aliases:
+            raise CommandError("No DATABASE_REPLICAS configured (use config.settings_replicas).")
+
+        # settings_dict rather than settings.DATABASES so test database names are used.
+        primary = connections["default"].settings_dict
+        if primary["ENGINE"] != "django.db.backends.sqlite3":
+            raise CommandError("sync_replicas only supports SQLite; use real replication elsewhere.")
+
+        for alias in aliases:
+            connections[alias].close()
+            source = sqlite3.connect(str(primary["NAME"]))
+            target = sqlite3.connect(str(connections[alias].settings_dict["NAME"]))
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+                source.close()
+            self.stdout.write(f"Synced {alias} from default.")
@@ -0,0 +1,55 @@
+import time
+
+from django.conf import settings
+
+from .routers import replica_reads_enabled
+
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+PRIMARY_PINNED_SESSION_KEY = "_primary_pinned_until"
+
+
+class ReplicaRoutingMiddleware:
+    """Serve reads of ``replica_reads`` views from replicas.
+
+    After a successful write the session is pinned to the primary for
+    ``REPLICA_STICKY_SECONDS`` so the client reads its own writes even while
+    the replicas lag behind.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            token = getattr(request, "_replica_reads_token", None)
+            if token is not None:
+                replica_reads_enabled.reset(token)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            session = getattr(request, "session", None)
+            if session is not None:
+                sticky_seconds = getattr(settings, "REPLICA_STICKY_SECONDS", 5)
+                session[PRIMARY_PINNED_SESSION_KEY] = time.time() + sticky_seconds
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method not in {"GET", "HEAD"}:
+            return None
+        if not getattr(view_func, "replica_reads", False):
+            return None
+        if self._pinned_to_primary(request):
+            return None
+
+        request._replica_reads_token = replica_reads_enabled.set(True)
+        return None
+
+    def _pinned_to_primary(self, request) -> bool:
+        session = getattr(request, "session", None)
+        if session is None:
+            return False
+        pinned_until = session.get(PRIMARY_PINNED_SESSION_KEY)
+        return pinned_until is not None and pinned_until > time.time()
@@ -0,0 +1,76 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+import django.db.models.deletion
+
+
+def backfill_aggregates(apps, schema_editor):
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+    Item = apps.get_model("core", "Item")
+    CartItem = apps.get_model("core", "CartItem")
+    SellerStats = apps.get_model("core", "SellerStats")
+    CartSummary = apps.get_model("core", "CartSummary")
+
+    for user_id in User.objects.values_list("id", flat=True):
+        seller = Item.objects.filter(owner_id=user_id).aggregate(
+            items_on_sale=Count("id", filter=Q(status="available")),
+            units_sold=Count("id", filter=Q(status="sold")),
+            revenue=Sum("price", filter=Q(status="sold")),
+        )
+        seller["revenue"] = seller["revenue"] or Decimal("0.00")
+        SellerStats.objects.create(user_id=user_id, **seller)
+
+        cart = CartItem.objects.filter(user_id=user_id).aggregate(
+            item_count=Count("id"),
+            total=Sum("item__price"),
+        )
+        cart["total"] = cart["total"] or Decimal("0.00")
+        CartSummary.objects.create(user_id=user_id, **cart)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0005_idempotencykey"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CartSummary",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="cart_summary",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("item_count", models.IntegerField(default=0)),
+                ("total", models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="SellerStats",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="seller_stats",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("items_on_sale", models.IntegerField(default=0)),
+                ("units_sold", models.IntegerField(default=0)),
+                ("revenue", models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+        ),
+        migrations.RunPython(backfill_aggregates, migrations.RunPython.noop),
+    ]
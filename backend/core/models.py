@@ -29,6 +29,8 @@ class Item(models.Model):
         blank=True,
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    # auto_now is skipped by bulk_update and by save(update_fields=...) unless listed.
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-created_at"]
@@ -48,3 +50,54 @@ class CartItem(models.Model):
 
     def __str__(self) -> str:
         return f"{self.user} -> {self.item}"
+
+
+class IdempotencyKey(models.Model):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="idempotency_keys")
+    key = models.CharField(max_length=255)
+    endpoint = models.CharField(max_length=64)
+    request_hash = models.CharField(max_length=64)
+    # Null while the first request is still running.
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    content_type = models.CharField(max_length=100, blank=True)
+    response_body = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        unique_together = ("user", "endpoint", "key")
+
+    def __str__(self) -> str:
+        return f"{self.user} {self.endpoint} {self.key}"
+
+
+class SellerStats(models.Model):
+    """Running totals over a seller's items, kept in step by ``core.aggregates``."""
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="seller_stats",
+    )
+    items_on_sale = models.IntegerField(default=0)
+    units_sold = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    def __str__(self) -> str:
+        return f"{self.user}: {self.items_on_sale} on sale, {self.units_sold} sold"
+
+
+class CartSummary(models.Model):
+    """Running item count and price total of a user's cart."""
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="cart_summary",
+    )
+    item_count = models.IntegerField(default=0)
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    def __str__(self) -> str:
+        return f"{self.user}: {self.item_count} items, {self.total}"
@@ -0,0 +1,149 @@
+import hmac
+import json
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+
+PROFILE_HEADER = "X-Profile-Token"
+
+# sys.setswitchinterval is process wide, so overlapping samplers share one
+# saved value and only the last one to finish restores it.
+_switch_lock = threading.Lock()
+_active_samplers = 0
+_saved_switch_interval: float | None = None
+
+
+def _acquire_switch_interval(interval: float) -> None:
+    global _active_samplers, _saved_switch_interval
+    with _switch_lock:
+        if _active_samplers == 0:
+            _saved_switch_interval = sys.getswitchinterval()
+        _active_samplers += 1
+        # The sampler needs the GIL to run; hand it over at least as often as we sample.
+        sys.setswitchinterval(min(_saved_switch_interval, interval, sys.getswitchinterval()))
+
+
+def _release_switch_interval() -> None:
+    global _active_samplers, _saved_switch_interval
+    with _switch_lock:
+        _active_samplers -= 1
+        if _active_samplers == 0:
+            sys.setswitchinterval(_saved_switch_interval)
+            _saved_switch_interval = None
+
+
+class StackSampler:
+    """Sample one thread's Python stack at a fixed interval.
+
+    Stacks are counted in the collapsed format (``outer;inner count``) read by
+    flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        _acquire_switch_interval(self.interval)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        _release_switch_interval()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if frames and not self._stop.is_set():
+                self.stacks[";".join(reversed(frames))] += 1
+
+
+class SqlTimer:
+    """Database execute wrapper that accumulates query count and time."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+
+
+class ProfilingMiddleware:
+    """Profile requests that carry the ``X-Profile-Token`` secret.
+
+    Only active with ``PROFILING_ENABLED``; each profiled request writes a
+    collapsed-stack file and a JSON summary to ``PROFILING_DIR``.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PROFILING_ENABLED", False) or not getattr(settings, "PROFILING_SECRET", ""):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.output_dir = Path(settings.PROFILING_DIR)
+        self.interval = getattr(settings, "PROFILING_INTERVAL", 0.001)
+
+    def __call__(self, request):
+        token = request.headers.get(PROFILE_HEADER, "")
+        if not token or not hmac.compare_digest(token.encode(), settings.PROFILING_SECRET.encode()):
+            return self.get_response(request)
+
+        sql_timer = SqlTimer()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(sql_timer))
+            sampler = stack.enter_context(StackSampler(threading.get_ident(), self.interval))
+            start = time.perf_counter()
+            response = self.get_response(request)
+            wall_seconds = time.perf_counter() - start
+
+        self._write_profile(request, response, sampler, sql_timer, wall_seconds)
+        return response
+
+    def _write_profile(self, request, response, sampler, sql_timer, wall_seconds) -> None:
+        match = getattr(request, "resolver_match", None)
+        endpoint = match.view_name if match else "unresolved"
+        base_name = f"{time.strftime('%Y%m%dT%H%M%S')}-{endpoint.replace(':', '_')}-{uuid.uuid4().hex[:8]}"
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.output_dir / f"{base_name}.collapsed", "w") as collapsed:
+            for stack, count in sampler.stacks.items():
+                collapsed.write(f"{stack} {count}\n")
+
+        summary = {
+            "endpoint": endpoint,
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "wall_ms": wall_seconds * 1000,
+            "sql_ms": sql_timer.seconds * 1000,
+            "sql_queries": sql_timer.count,
+            "samples": sum(sampler.stacks.values()),
+            "collapsed": f"{base_name}.collapsed",
+        }
+        with open(self.output_dir / f"{base_name}.json", "w") as summary_file:
+            json.dump(summary, summary_file, indent=2)
@@ -0,0 +1,180 @@
+import math
+import threading
+import time
+from dataclasses import dataclass
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import JsonResponse
+
+from .http import with_cors
+
+
+_PERIODS = {"s": 1, "m": 60, "h": 3600}
+
+
+@dataclass(frozen=True)
+class Rate:
+    capacity: int
+    per_second: float
+
+    @classmethod
+    def parse(cls, value: str) -> "Rate":
+        """Parse ``"<tokens>/<s|m|h>"``, e.g. ``"10/m"`` for 10 per minute."""
+        count, _, period = value.partition("/")
+        return cls(capacity=int(count), per_second=int(count) / _PERIODS[period])
+
+
+class InMemoryBucketStore:
+    """Buckets local to this worker process.
+
+    A bucket that has refilled completely behaves exactly like a missing one,
+    so such buckets are swept at most every ``sweep_interval`` seconds to keep
+    one entry per client ever seen from piling up.
+    """
+
+    def __init__(self, sweep_interval: float = 60.0):
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._full_at: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._sweep_interval = sweep_interval
+        self._next_sweep = 0.0
+
+    def take_all(self, buckets: list[tuple[str, Rate]], now: float) -> float:
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+            states = [self._buckets.get(key) for key, _ in buckets]
+            wait, new_states = _take_tokens(states, [rate for _, rate in buckets], now)
+            if new_states is not None:
+                for (key, rate), state in zip(buckets, new_states):
+                    self._buckets[key] = state
+                    self._full_at[key] = now + (rate.capacity - state[0]) / rate.per_second
+        return wait
+
+    def _sweep(self, now: float) -> None:
+        for key in [key for key, full_at in self._full_at.items() if full_at <= now]:
+            del self._buckets[key]
+            del self._full_at[key]
+        self._next_sweep = now + self._sweep_interval
+
+
+class CacheBucketStore:
+    """Buckets shared by every worker through a Django cache alias.
+
+    The read-modify-write is not atomic across workers, so under contention a
+    bucket can briefly admit a few extra requests; that is fine for shedding
+    load and avoids a lock round trip per request.
+    """
+
+    def __init__(self, alias: str = "default"):
+        self.alias = alias
+
+    def take_all(self, buckets: list[tuple[str, Rate]], now: float) -> float:
+        cache = caches[self.alias]
+        cache_keys = [f"ratelimit:{key}" for key, _ in buckets]
+        rates = [rate for _, rate in buckets]
+        stored = cache.get_many(cache_keys)
+        wait, new_states = _take_tokens([stored.get(key) for key in cache_keys], rates, now)
+        if new_states is not None:
+            timeout = max(math.ceil(rate.capacity / rate.per_second) + 1 for rate in rates)
+            cache.set_many(dict(zip(cache_keys, new_states)), timeout=timeout)
+        return wait
+
+
+def _take_tokens(states, rates: list[Rate], now: float) -> tuple[float, list[tuple[float, float]] | None]:
+    """Take one token from every bucket, or from none of them.
+
+    Returns the seconds to wait (0 when admitted) and the new bucket states,
+    which are None when the request is rejected so no bucket is drained by a
+    request another bucket refused.
+    """
+    wait = 0.0
+    refilled: list[float] = []
+    for state, rate in zip(states, rates):
+        if state is None:
+            tokens = float(rate.capacity)
+        else:
+            tokens, updated_at = state
+            tokens = min(rate.capacity, tokens + (now - updated_at) * rate.per_second)
+        if tokens < 1:
+            wait = max(wait, (1 - tokens) / rate.per_second)
+        refilled.append(tokens)
+
+    if wait:
+        return wait, None
+    return 0.0, [(tokens - 1, now) for tokens in refilled]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_bucket_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                backend = getattr(settings, "RATE_LIMIT_BACKEND", "memory")
+                if backend == "cache":
+                    _store = CacheBucketStore(getattr(settings, "RATE_LIMIT_CACHE", "default"))
+                else:
+                    _store = InMemoryBucketStore()
+    return _store
+
+
+def reset_bucket_store() -> None:
+    global _store
+    _store = None
+
+
+def _client_ip(request) -> str:
+    return request.META.get("REMOTE_ADDR") or "unknown"
+
+
+def rate_limit(scope: str, *, per_user=None, per_ip=None, global_rate=None, methods=("POST",)):
+    """Reject requests with 429 once any of the scope's token buckets is empty.
+
+    A token is only taken when every bucket admits the request, so requests
+    refused by one client's bucket never drain the shared global bucket.
+
+    Buckets are checked before the view runs, so throttled requests never
+    reach password hashing or row locks. Anonymous requests skip ``per_user``.
+    """
+    limits = [
+        (kind, Rate.parse(value))
+        for kind, value in (("user", per_user), ("ip", per_ip), ("global", global_rate))
+        if value
+    ]
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped(request, *args, **kwargs):
+            if request.method not in methods or not getattr(settings, "RATE_LIMIT_ENABLED", True):
+                return view_func(request, *args, **kwargs)
+
+            buckets: list[tuple[str, Rate]] = []
+            for kind, rate in limits:
+                if kind == "user":
+                    if not request.user.is_authenticated:
+                        continue
+                    key = f"{scope}:user:{request.user.pk}"
+                elif kind == "ip":
+                    key = f"{scope}:ip:{_client_ip(request)}"
+                else:
+                    key = f"{scope}:global"
+                buckets.append((key, rate))
+
+            retry_after = get_bucket_store().take_all(buckets, time.time()) if buckets else 0.0
+
+            if retry_after:
+                response = JsonResponse({"message": "Too many requests, please retry later."}, status=429)
+                response["Retry-After"] = str(math.ceil(retry_after))
+                return with_cors(request, response)
+
+            return view_func(request, *args, **kwargs)
+
+        return _wrapped
+
+    return decorator
@@ -0,0 +1,60 @@
+import random
+from contextvars import ContextVar
+from contextlib import contextmanager
+
+from django.conf import settings
+
+
+replica_reads_enabled: ContextVar[bool] = ContextVar("replica_reads_enabled", default=False)
+
+
+def replica_reads(view_func):
+    """Mark a view as safe to serve its GET/HEAD reads from a replica."""
+    view_func.replica_reads = True
+    return view_func
+
+
+@contextmanager
+def reading_from_replica():
+    token = replica_reads_enabled.set(True)
+    try:
+        yield
+    finally:
+        replica_reads_enabled.reset(token)
+
+
+def replica_aliases() -> list[str]:
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+def replica_reads_active() -> bool:
+    """True when reads in the current context may be served by a lagging replica."""
+    return replica_reads_enabled.get() and bool(replica_aliases())
+
+
+class PrimaryReplicaRouter:
+    """Send writes to ``default`` and opted-in reads to a configured replica.
+
+    Reads only leave the primary while ``reading_from_replica()`` is active or
+    the replica routing middleware has enabled it for a ``replica_reads`` view.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not replica_reads_enabled.get():
+            return "default"
+        aliases = replica_aliases()
+        if not aliases:
+            return "default"
+        return random.choice(aliases)
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {"default", *replica_aliases()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
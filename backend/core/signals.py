@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .aggregates import create_rows_for_user
+from .listing_cache import bump_catalogue_version
+from .models import Item
+
+
+@receiver(post_save, sender=Item)
+@receiver(post_delete, sender=Item)
+def invalidate_listing_cache(sender, **kwargs):
+    bump_catalogue_version()
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def create_aggregate_rows(sender, instance, created, **kwargs):
+    if created:
+        create_rows_for_user(instance.pk)
@@ -0,0 +1,644 @@
+import json
+import time
+from io import StringIO
+from pathlib import Path
+import sys
+import tempfile
+import threading
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.contrib.auth import authenticate, get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError, SystemCheckError
+from django.db import transaction
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+
+from .bulk_import import import_items
+from .checks import check_api_only_profile
+from .listing_cache import catalogue_version
+from .profiling import StackSampler
+from . import aggregates
+from .aggregates import get_cart_summary, get_seller_stats, rebuild_all
+from .models import CartItem, CartSummary, IdempotencyKey, Item, SellerStats, STATUS_SOLD
+from .ratelimit import InMemoryBucketStore, Rate, reset_bucket_store
+
+
+def _post_json(client, path, payload, **extra):
+    return client.post(path, json.dumps(payload), content_type="application/json", **extra)
+
+
+# DATABASE_REPLICAS=[] keeps reads on the primary under config.settings_replicas.
+@override_settings(RATE_LIMIT_ENABLED=True, RATE_LIMIT_BACKEND="memory", DATABASE_REPLICAS=[])
+class RateLimitTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("alice", password="secret")
+        Item.objects.bulk_create(
+            Item(owner=cls.user, name=f"Item {index}", price=index) for index in range(1, 21)
+        )
+
+    def setUp(self):
+        cache.clear()
+        reset_bucket_store()
+        self.addCleanup(reset_bucket_store)
+
+    def _login(self, ip: str, password: str):
+        return _post_json(
+            self.client, "/api/login/", {"username": "alice", "password": password}, REMOTE_ADDR=ip
+        )
+
+    def _flood_then_login_from_elsewhere(self):
+        # Rehash with the (fast) hasher the calling test configured.
+        self.user.set_password("secret")
+        self.user.save(update_fields=["password"])
+        # Freeze the clock so no bucket refills while the flood runs.
+        with mock.patch("core.ratelimit.time.time", return_value=1_000_000.0):
+            statuses = [self._login("10.0.0.1", "wrong").status_code for _ in range(30)]
+            other_client = self._login("10.0.0.2", "secret")
+        return statuses, other_client
+
+    @override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+    def test_rejected_requests_do_not_drain_global_bucket(self):
+        statuses, other_client = self._flood_then_login_from_elsewhere()
+
+        self.assertEqual(statuses.count(401), 10)
+        self.assertEqual(statuses.count(429), 20)
+        self.assertEqual(other_client.status_code, 200)
+
+    @override_settings(
+        RATE_LIMIT_BACKEND="cache",
+        PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    )
+    def test_cache_backend_rejects_without_draining_global_bucket(self):
+        statuses, other_client = self._flood_then_login_from_elsewhere()
+
+        self.assertEqual(statuses.count(429), 20)
+        self.assertEqual(other_client.status_code, 200)
+
+    def test_throttled_logins_skip_hashing(self):
+        # Latency under a flood is measured by bench_login_flood, not here.
+        with mock.patch("core.ratelimit.time.time", return_value=1_000_000.0):
+            with mock.patch("core.views.authenticate", wraps=authenticate) as authenticate_spy:
+                statuses = [self._login("10.0.0.1", "wrong").status_code for _ in range(40)]
+                browse = self.client.get("/api/items/")
+
+        self.assertEqual(authenticate_spy.call_count, 10)
+        self.assertEqual(statuses.count(429), 30)
+        self.assertEqual(browse.status_code, 200)
+
+    def test_memory_store_drops_refilled_buckets(self):
+        store = InMemoryBucketStore(sweep_interval=10)
+        rate = Rate.parse("10/m")
+        for index in range(100):
+            store.take_all([(f"ip:{index}", rate), ("global", Rate.parse("1000/h"))], 1_000.0)
+        store.take_all([("ip:0", rate)], 1_004.0)
+
+        self.assertEqual(len(store._buckets), 101)
+        # ip:1..99 refilled after 6s; ip:0 and the global bucket have not yet.
+        self.assertEqual(store.take_all([("ip:1", rate)], 1_010.0), 0.0)
+        self.assertEqual(sorted(store._buckets), ["global", "ip:0", "ip:1"])
+        self.assertAlmostEqual(store._buckets["ip:0"][0], 8 + 4 * rate.per_second)
+
+    def test_rejection_sets_retry_after(self):
+        with mock.patch("core.ratelimit.time.time", return_value=1_000_000.0):
+            for _ in range(10):
+                self._login("10.0.0.1", "wrong")
+            response = self._login("10.0.0.1", "wrong")
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "6")
+
+
+@override_settings(DATABASE_REPLICAS=[])
+class ListingCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user("seller", password="secret")
+        # Run the bump now; a pending one would absorb the bumps under test.
+        with self.captureOnCommitCallbacks(execute=True):
+            Item.objects.create(owner=self.user, name="First", price=1)
+
+    def test_version_is_bumped_only_after_commit(self):
+        before = catalogue_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            Item.objects.create(owner=self.user, name="Second", price=2)
+            self.assertEqual(catalogue_version(), before)
+        self.assertEqual(catalogue_version(), before + 1)
+
+    def test_bulk_delete_queues_a_single_bump(self):
+        Item.objects.bulk_create(Item(owner=self.user, name=f"Bulk {index}", price=index) for index in range(50))
+        ids = list(Item.objects.values_list("id", flat=True))
+        before = catalogue_version()
+
+        self.client.force_login(self.user)
+        with mock.patch("core.listing_cache.cache.incr", wraps=cache.incr) as incr_spy:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.delete(
+                    "/api/items/bulk/", data=json.dumps({"ids": ids}), content_type="application/json"
+                )
+
+        self.assertEqual(response.json()["deleted"], 51)
+        self.assertEqual(incr_spy.call_count, 1)
+        self.assertEqual(catalogue_version(), before + 1)
+
+    def test_bump_survives_savepoint_rollback(self):
+        before = catalogue_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    Item.objects.create(owner=self.user, name="Rolled back", price=2)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            Item.objects.create(owner=self.user, name="Kept", price=3)
+        self.assertEqual(catalogue_version(), before + 1)
+
+    def test_listing_reflects_new_item_after_commit(self):
+        self.assertEqual(len(self.client.get("/api/items/").json()), 1)
+
+        self.client.force_login(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = _post_json(self.client, "/api/items/", {"title": "Second", "price": "2"})
+        self.assertEqual(response.status_code, 201)
+
+        titles = [item["title"] for item in self.client.get("/api/items/").json()]
+        self.assertEqual(titles, ["Second", "First"])
+
+
+@skipUnless(
+    getattr(settings, "DATABASE_REPLICAS", None),
+    "needs replicas: run with --settings=config.settings_replicas",
+)
+@override_settings(RATE_LIMIT_ENABLED=False, REPLICA_STICKY_SECONDS=5)
+class ReplicaRoutingTests(TransactionTestCase):
+    """Primary and replica are separate SQLite files, synced only on demand."""
+
+    databases = "__all__"
+
+    def setUp(self):
+        cache.clear()
+        self.seller = get_user_model().objects.create_user("seller", password="secret")
+        self.sync_replicas()
+
+    def sync_replicas(self):
+        call_command("sync_replicas", stdout=StringIO())
+
+    def _titles(self, client, path="/api/items/"):
+        return [item["title"] for item in client.get(path).json()]
+
+    def test_unpinned_session_reads_stale_replica_until_synced(self):
+        Item.objects.create(owner=self.seller, name="Fresh", price=1)
+
+        self.assertEqual(self._titles(self.client), [])
+        self.sync_replicas()
+        self.assertEqual(self._titles(self.client), ["Fresh"])
+
+    def test_writer_reads_own_writes_within_sticky_window(self):
+        writer = self.client_class()
+        _post_json(writer, "/api/login/", {"username": "seller", "password": "secret"})
+        response = _post_json(writer, "/api/items/", {"title": "Fresh", "price": "1"})
+        self.assertEqual(response.status_code, 201)
+
+        # A bystander's stale replica read must not be cached for the writer.
+        self.assertEqual(self._titles(self.client), [])
+        self.assertEqual(self._titles(writer), ["Fresh"])
+        self.assertEqual(self._titles(writer, "/api/items/?mine=1"), ["Fresh"])
+
+        with mock.patch("core.middleware.time.time", return_value=time.time() + 60):
+            self.assertEqual(self._titles(writer, "/api/items/?mine=1"), [])
+
+
+@override_settings(DATABASE_REPLICAS=[])
+class BulkImportTests(TestCase):
+    def setUp(self):
+        self.seller = get_user_model().objects.create_user("seller", password="secret")
+
+    def test_non_string_fields_are_reported_per_row(self):
+        lines = [
+            b'{"title": "Good", "price": "1.50"}\n',
+            b'{"title": 123, "price": "2"}\n',
+            b'{"title": "Bad description", "description": ["x"], "price": "3"}\n',
+            b'{"title": "Also good", "price": 4}\n',
+        ]
+
+        report = import_items(self.seller, lines, "ndjson")
+
+        self.assertEqual(report["created"], 2)
+        self.assertEqual([error["row"] for error in report["errors"]], [2, 3])
+        self.assertEqual(
+            sorted(Item.objects.values_list("name", flat=True)), ["Also good", "Good"]
+        )
+
+    def test_endpoint_reports_invalid_csv_rows(self):
+        self.client.force_login(self.seller)
+        body = "title,description,price\nChair,Oak,10\n,Missing title,2\nTable,,abc\n"
+
+        response = self.client.generic("POST", "/api/items/import/", body, content_type="text/csv")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["created"], 1)
+        self.assertEqual([error["row"] for error in response.json()["errors"]], [2, 3])
+
+
+class StackSamplerTests(TestCase):
+    def test_overlapping_samplers_restore_switch_interval(self):
+        original = sys.getswitchinterval()
+        thread_id = threading.get_ident()
+
+        first = StackSampler(thread_id, 0.001)
+        second = StackSampler(thread_id, 0.001)
+        first.__enter__()
+        second.__enter__()
+        first.__exit__(None, None, None)
+        self.assertEqual(sys.getswitchinterval(), 0.001)
+        second.__exit__(None, None, None)
+
+        self.assertEqual(sys.getswitchinterval(), original)
+
+
+
+@override_settings(DATABASE_REPLICAS=[], PROFILING_ENABLED=True, PROFILING_SECRET="s3cret")
+class ProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        output_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(output_dir.cleanup)
+        self.output_dir = Path(output_dir.name)
+        override = override_settings(PROFILING_DIR=self.output_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_request_with_token_writes_profile(self):
+        response = self.client.get("/api/items/", HTTP_X_PROFILE_TOKEN="s3cret")
+
+        self.assertEqual(response.status_code, 200)
+        [summary_path] = self.output_dir.glob("*.json")
+        summary = json.loads(summary_path.read_text())
+        self.assertEqual((summary["endpoint"], summary["method"], summary["status"]), ("list-items", "GET", 200))
+        self.assertGreaterEqual(summary["sql_queries"], 1)
+        self.assertTrue((self.output_dir / summary["collapsed"]).exists())
+
+    def test_wrong_or_non_ascii_token_is_served_unprofiled(self):
+        for token in ("wrong", "s3crét"):
+            response = self.client.get("/api/items/", HTTP_X_PROFILE_TOKEN=token)
+            self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(list(self.output_dir.iterdir()), [])
+
+@override_settings(RATE_LIMIT_ENABLED=False, DATABASE_REPLICAS=[])
+class IdempotencyTests(TestCase):
+    def setUp(self):
+        self.seller = get_user_model().objects.create_user("seller", password="secret")
+        self.client.force_login(self.seller)
+
+    def _create(self, key="key-1", title="Chair"):
+        return _post_json(
+            self.client, "/api/items/", {"title": title, "price": "5"}, HTTP_IDEMPOTENCY_KEY=key
+        )
+
+    def test_repeated_key_replays_without_creating_again(self):
+        first = self._create()
+        second = self._create()
+
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(Item.objects.count(), 1)
+
+    def test_reused_key_with_different_body_is_rejected(self):
+        self._create()
+        self.assertEqual(self._create(title="Table").status_code, 422)
+
+    def test_attempt_whose_key_was_reclaimed_rolls_back(self):
+        def reclaim(*args, **kwargs):
+            IdempotencyKey.objects.all().delete()
+
+        with mock.patch("core.aggregates.record_items_listed", side_effect=reclaim):
+            response = self._create()
+
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Item.objects.exists())
+
+
+@override_settings(RATE_LIMIT_ENABLED=False, DATABASE_REPLICAS=[])
+class BulkItemsTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.seller = User.objects.create_user("seller", password="secret")
+        other = User.objects.create_user("other", password="secret")
+        self.own = Item.objects.create(owner=self.seller, name="Own", price="1.00")
+        self.own_bad_price = Item.objects.create(owner=self.seller, name="Own bad price", price="2.00")
+        self.sold = Item.objects.create(owner=self.seller, name="Sold", price="3.00", status=STATUS_SOLD)
+        self.foreign = Item.objects.create(owner=other, name="Foreign", price="4.00")
+        self.missing_id = self.foreign.id + 100
+        self.client.force_login(self.seller)
+
+    def _send(self, method, payload):
+        return getattr(self.client, method)(
+            "/api/items/bulk/", data=json.dumps(payload), content_type="application/json"
+        )
+
+    def _prices(self):
+        return {item.id: str(item.price) for item in Item.objects.all()}
+
+    def test_patch_reports_each_id_and_updates_only_owned_available_items(self):
+        response = self._send(
+            "patch",
+            {
+                "items": [
+                    {"id": self.own.id, "price": "9.50"},
+                    {"id": self.own_bad_price.id, "price": "cheap"},
+                    {"id": self.sold.id, "price": "9.50"},
+                    {"id": self.foreign.id, "price": "9.50"},
+                    {"id": self.missing_id, "price": "9.50"},
+                ]
+            },
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["updated"], 1)
+        self.assertEqual(
+            response.json()["results"],
+            [
+                {"id": self.own.id, "status": "updated"},
+                {"id": self.own_bad_price.id, "status": "invalid_price"},
+                {"id": self.sold.id, "status": "not_available"},
+                {"id": self.foreign.id, "status": "forbidden"},
+                {"id": self.missing_id, "status": "not_found"},
+            ],
+        )
+        self.assertEqual(
+            self._prices(),
+            {self.own.id: "9.50", self.own_bad_price.id: "2.00", self.sold.id: "3.00", self.foreign.id: "4.00"},
+        )
+
+    def test_delete_reports_each_id_and_removes_only_owned_available_items(self):
+        ids = [self.own.id, self.own_bad_price.id, self.sold.id, self.foreign.id, self.missing_id]
+        response = self._send("delete", {"ids": ids})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["deleted"], 2)
+        self.assertEqual(
+            response.json()["results"],
+            [
+                {"id": self.own.id, "status": "deleted"},
+                {"id": self.own_bad_price.id, "status": "deleted"},
+                {"id": self.sold.id, "status": "not_available"},
+                {"id": self.foreign.id, "status": "forbidden"},
+                {"id": self.missing_id, "status": "not_found"},
+            ],
+        )
+        self.assertEqual(set(Item.objects.values_list("id", flat=True)), {self.sold.id, self.foreign.id})
+
+    @mock.patch("core.views.MAX_BULK_ITEMS", 3)
+    def test_requests_over_the_limit_are_rejected(self):
+        patch = self._send("patch", {"items": [{"id": self.own.id, "price": "1"}] * 4})
+        delete = self._send("delete", {"ids": [self.own.id] * 4})
+
+        self.assertEqual((patch.status_code, delete.status_code), (400, 400))
+        self.assertEqual(self._prices()[self.own.id], "1.00")
+
+    def test_non_integer_ids_are_rejected(self):
+        patch = self._send("patch", {"items": [{"id": self.own.id, "price": "5"}, {"id": "abc", "price": "5"}]})
+        delete = self._send("delete", {"ids": [self.own.id, "abc"]})
+
+        self.assertEqual((patch.status_code, delete.status_code), (400, 400))
+        self.assertEqual(self._prices()[self.own.id], "1.00")
+
+
+@override_settings(RATE_LIMIT_ENABLED=False, DATABASE_REPLICAS=[])
+class ItemDetailTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.seller = User.objects.create_user("seller", password="secret")
+        self.buyer = User.objects.create_user("buyer", password="secret")
+        self.stranger = User.objects.create_user("stranger", password="secret")
+        self.item = Item.objects.create(owner=self.seller, name="Chair", price="10.00")
+
+    def _get(self, user=None, **headers):
+        if user is not None:
+            self.client.force_login(user)
+        return self.client.get(f"/api/items/{self.item.id}/", **headers)
+
+    def test_available_item_is_public(self):
+        response = self._get()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["buyer"], None)
+
+    def test_sold_item_is_only_visible_to_seller_and_buyer(self):
+        Item.objects.filter(pk=self.item.pk).update(status=STATUS_SOLD, buyer=self.buyer)
+
+        self.assertEqual(self._get().status_code, 404)
+        self.assertEqual(self._get(self.stranger).status_code, 404)
+        self.assertEqual(self._get(self.seller).json()["buyer"], "buyer")
+        self.assertEqual(self._get(self.buyer).json()["buyer"], "buyer")
+
+
+    def test_matching_validators_get_not_modified(self):
+        first = self._get()
+
+        self.assertEqual(self._get(HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+        self.assertEqual(self._get(HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]).status_code, 304)
+
+    @override_settings(COMPRESSION_MIN_SIZE=0)
+    def test_weak_etag_from_compression_still_matches(self):
+        first = self._get(HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(first["Content-Encoding"], "gzip")
+        self.assertTrue(first["ETag"].startswith("W/"))
+
+        again = self._get(HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(again.status_code, 304)
+
+    def test_etag_changes_after_patch_bulk_reprice_and_checkout(self):
+        seller = Client()
+        seller.force_login(self.seller)
+        etags = [self._get()["ETag"]]
+
+        seller.patch(f"/api/items/{self.item.id}/", data=json.dumps({"price": "11"}), content_type="application/json")
+        etags.append(self._get()["ETag"])
+
+        seller.patch(
+            "/api/items/bulk/",
+            data=json.dumps({"items": [{"id": self.item.id, "price": "12"}]}),
+            content_type="application/json",
+        )
+        etags.append(self._get()["ETag"])
+
+        self.client.force_login(self.buyer)
+        _post_json(self.client, "/api/cart/", {"item_id": self.item.id})
+        self.assertEqual(_post_json(self.client, "/api/cart/pay/", {}).status_code, 200)
+        etags.append(self._get()["ETag"])
+
+        self.assertEqual(len(set(etags)), 4)
+        self.assertEqual(self._get(HTTP_IF_NONE_MATCH=etags[0]).status_code, 200)
+
+
+@override_settings(RATE_LIMIT_ENABLED=False, DATABASE_REPLICAS=[])
+class CartConditionalGetTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.seller = User.objects.create_user("seller", password="secret")
+        self.buyer = User.objects.create_user("buyer", password="secret")
+        self.chair = Item.objects.create(owner=self.seller, name="Chair", price="10.00")
+        self.table = Item.objects.create(owner=self.seller, name="Table", price="20.00")
+        self.client.force_login(self.buyer)
+
+    def _etag(self):
+        response = self.client.get("/api/cart/")
+        self.assertEqual(response.status_code, 200)
+        return response["ETag"]
+
+    def test_unchanged_cart_is_not_modified(self):
+        _post_json(self.client, "/api/cart/", {"item_id": self.chair.id})
+        etag = self._etag()
+
+        self.assertEqual(self.client.get("/api/cart/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_etag_changes_on_add_remove_and_reprice(self):
+        etags = [self._etag()]
+        _post_json(self.client, "/api/cart/", {"item_id": self.chair.id})
+        etags.append(self._etag())
+        _post_json(self.client, "/api/cart/", {"item_id": self.table.id})
+        etags.append(self._etag())
+
+        self.client.delete(f"/api/cart/{CartItem.objects.get(item=self.chair).id}/")
+        etags.append(self._etag())
+
+        seller = Client()
+        seller.force_login(self.seller)
+        seller.patch(f"/api/items/{self.table.id}/", data=json.dumps({"price": "19"}), content_type="application/json")
+        etags.append(self._etag())
+
+        self.assertEqual(len(set(etags)), 5)
+        self.assertEqual(self.client.get("/api/cart/", HTTP_IF_NONE_MATCH=etags[-2]).status_code, 200)
+
+
+@override_settings(RATE_LIMIT_ENABLED=False, DATABASE_REPLICAS=[])
+class AggregateTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.seller = User.objects.create_user("seller", password="secret")
+        self.buyer = User.objects.create_user("buyer", password="secret")
+        self.item = Item.objects.create(owner=self.seller, name="Chair", price="10.00")
+        rebuild_all()
+
+    def test_cart_remove_already_done_concurrently_is_not_counted_again(self):
+        self.client.force_login(self.buyer)
+        _post_json(self.client, "/api/cart/", {"item_id": self.item.id})
+        entry = CartItem.objects.get(user=self.buyer)
+        original_delete = CartItem.delete
+
+        def delete_after_concurrent_remove(instance, *args, **kwargs):
+            # The other request of a double click wins the race and removes the row first.
+            CartItem.objects.filter(pk=instance.pk).delete()
+            return original_delete(instance, *args, **kwargs)
+
+        with mock.patch.object(CartItem, "delete", delete_after_concurrent_remove):
+            self.client.delete(f"/api/cart/{entry.id}/")
+
+        summary = get_cart_summary(self.buyer.id)
+        self.assertEqual(summary.item_count, 1)
+
+    def test_cart_remove_uses_price_committed_after_entry_was_loaded(self):
+        self.client.force_login(self.buyer)
+        _post_json(self.client, "/api/cart/", {"item_id": self.item.id})
+        entry = CartItem.objects.select_related("item").get(user=self.buyer)
+
+        def load_then_reprice(*args, **kwargs):
+            # The seller's reprice commits right after the DELETE loaded the entry.
+            Item.objects.filter(pk=self.item.pk).update(price="25.00")
+            aggregates.refresh_carts([self.buyer.id])
+            return entry
+
+        with mock.patch("core.views.CartItem.objects.get", side_effect=load_then_reprice):
+            self.client.delete(f"/api/cart/{entry.id}/")
+
+        summary = get_cart_summary(self.buyer.id)
+        self.assertEqual((summary.item_count, summary.total), (0, 0))
+
+    def test_deleting_an_item_sold_after_it_was_loaded_adjusts_sales(self):
+        self.client.force_login(self.seller)
+        stale_item = Item.objects.get(pk=self.item.pk)
+
+        # Checkout sells the item after the DELETE request has loaded it.
+        Item.objects.filter(pk=self.item.pk).update(status=STATUS_SOLD, buyer=self.buyer)
+        rebuild_all()
+        with mock.patch("core.views.Item.objects.get", return_value=stale_item):
+            response = self.client.delete(f"/api/items/{self.item.id}/")
+
+        self.assertEqual(response.status_code, 200)
+        stats = get_seller_stats(self.seller.id)
+        self.assertEqual((stats.items_on_sale, stats.units_sold, stats.revenue), (0, 0, 0))
+
+    def _get_json(self, user, path):
+        self.client.force_login(user)
+        return self.client.get(path).json()
+
+    def test_endpoints_follow_create_reprice_pay_and_delete(self):
+        self.client.force_login(self.seller)
+        created = _post_json(self.client, "/api/items/", {"title": "Lamp", "price": "4.00"}).json()
+        self.assertEqual(
+            self._get_json(self.seller, "/api/stats/"), {"items_on_sale": 2, "units_sold": 0, "revenue": "0.00"}
+        )
+
+        self.client.force_login(self.buyer)
+        _post_json(self.client, "/api/cart/", {"item_id": self.item.id})
+        self.client.force_login(self.seller)
+        self.client.patch(
+            f"/api/items/{self.item.id}/", data=json.dumps({"price": "12.00"}), content_type="application/json"
+        )
+        self.assertEqual(self._get_json(self.buyer, "/api/cart/summary/"), {"item_count": 1, "total": "12.00"})
+
+        self.assertEqual(_post_json(self.client, "/api/cart/pay/", {}).status_code, 200)
+        self.assertEqual(self._get_json(self.buyer, "/api/cart/summary/"), {"item_count": 0, "total": "0.00"})
+
+        self.client.force_login(self.seller)
+        self.client.delete(f"/api/items/{created['item']['id']}/")
+        self.assertEqual(
+            self._get_json(self.seller, "/api/stats/"), {"items_on_sale": 0, "units_sold": 1, "revenue": "12.00"}
+        )
+
+    def test_reconcile_reports_drift_and_fix_repairs_it(self):
+        SellerStats.objects.filter(user=self.seller).update(items_on_sale=5)
+        CartSummary.objects.filter(user=self.buyer).delete()
+
+        with self.assertRaises(CommandError):
+            call_command("reconcile_aggregates", stdout=StringIO())
+        out = StringIO()
+        call_command("reconcile_aggregates", "--fix", stdout=out)
+
+        self.assertIn(f"user {self.seller.id} SellerStats: items_on_sale 5 != 1", out.getvalue())
+        self.assertIn(f"user {self.buyer.id} CartSummary: missing", out.getvalue())
+        self.assertEqual(get_seller_stats(self.seller.id).items_on_sale, 1)
+        self.assertTrue(CartSummary.objects.filter(user=self.buyer).exists())
+        call_command("reconcile_aggregates", stdout=StringIO())
+
+class ApiProfileCheckTests(TestCase):
+    excluded = {
+        "API_ONLY_EXCLUDED_APPS": ["django.contrib.admin"],
+        "API_ONLY_EXCLUDED_MIDDLEWARE": ["django.middleware.clickjacking.XFrameOptionsMiddleware"],
+    }
+
+    def test_check_flags_excluded_apps_middleware_and_templates(self):
+        # The default settings still carry everything the API profile removes.
+        with override_settings(API_ONLY=True, **self.excluded):
+            errors = check_api_only_profile(None)
+            with self.assertRaises(SystemCheckError):
+                call_command("check", tags=["api"], stdout=StringIO(), stderr=StringIO())
+
+        self.assertEqual(sorted(error.id for error in errors), ["core.E001", "core.E002", "core.E003"])
+
+    def test_check_passes_for_lean_settings(self):
+        with override_settings(
+            API_ONLY=True,
+            API_ONLY_EXCLUDED_APPS=["django.contrib.not_installed"],
+            API_ONLY_EXCLUDED_MIDDLEWARE=["core.middleware.NotInstalled"],
+            TEMPLATES=[],
+        ):
+            self.assertEqual(check_api_only_profile(None), [])
+
+    def test_check_is_silent_outside_the_api_profile(self):
+        with override_settings(API_ONLY=False, **self.excluded):
+            self.assertEqual(check_api_only_profile(None), [])
@@ -5,8 +5,11 @@ urlpatterns = [
     path("", views.api_placeholder, name="api-placeholder"),
     path("seed-demo/", views.populate_demo_data, name="populate-demo-data"),
     path("items/", views.list_items, name="list-items"),
+    path("items/bulk/", views.bulk_items, name="bulk-items"),
+    path("items/import/", views.import_items_view, name="import-items"),
     path("items/<int:item_id>/", views.item_detail, name="item-detail"),
     path("cart/", views.cart_view, name="cart"),
+    path("cart/summary/", views.cart_summary, name="cart-summary"),
     path("cart/pay/", views.cart_pay, name="cart-pay"),
     path("cart/<int:cart_item_id>/", views.cart_item_detail, name="cart-item-detail"),
     path("signup/", views.signup, name="signup"),
@@ -15,4 +18,5 @@ urlpatterns = [
     path("logout/", views.logout_view, name="logout"),
     path("change-password/", views.change_password, name="change-password"),
     path("inventory/", views.inventory_view, name="inventory"),
+    path("stats/", views.stats_view, name="stats"),
 ]
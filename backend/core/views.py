@@ -4,10 +4,25 @@ from decimal import Decimal
 from django.contrib.auth import get_user_model
 from django.contrib.auth import authenticate, login, logout
 from django.db import transaction
+from django.db.models import Count, Max
 from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from django.views.decorators.csrf import csrf_exempt
 
+from . import aggregates
+from .http import with_cors
+from .idempotency import idempotent
+from .listing_cache import (
+    bump_catalogue_version,
+    cache_listing,
+    get_cached_listing,
+    listing_cache_key,
+)
 from .models import Item, CartItem, STATUS_AVAILABLE, STATUS_SOLD
+from .ratelimit import rate_limit
+from .routers import replica_reads, replica_reads_active
 
 
 def landing(request):
@@ -19,19 +34,6 @@ def api_placeholder(request):
     return JsonResponse(payload)
 
 
-def _with_cors(request, response: HttpResponse) -> HttpResponse:
-    origin = request.headers.get("Origin")
-    if origin:
-        response["Access-Control-Allow-Origin"] = origin
-        response["Access-Control-Allow-Credentials"] = "true"
-    else:
-        response["Access-Control-Allow-Origin"] = "*"
-    response["Access-Control-Allow-Headers"] = "Content-Type"
-
-    response["Access-Control-Allow-Methods"] = "GET, POST, PATCH, PUT, DELETE, OPTIONS"
-    return response
-
-
 def _serialize_item(item: Item) -> dict:
     return {
         "id": item.id,
@@ -45,13 +47,44 @@ def _serialize_item(item: Item) -> dict:
     }
 
 
+def _conditional(request, etag: str, last_modified, build_response) -> HttpResponse:
+    """Answer 304 when the client's validators still match, else build the response."""
+    last_modified_ts = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified_ts)
+    if response is None:
+        response = build_response()
+    response["ETag"] = etag
+    if last_modified_ts is not None:
+        response["Last-Modified"] = http_date(last_modified_ts)
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def _cart_version(user) -> str:
+    """Fingerprint of a user's cart that changes whenever its GET body would.
+
+    Adding an entry raises ``last_added``, removing one lowers ``count`` and
+    any change to a carted item raises ``last_item_change``.
+    """
+    stats = CartItem.objects.filter(user=user).aggregate(
+        count=Count("id"),
+        last_added=Max("created_at"),
+        last_item_change=Max("item__updated_at"),
+    )
+    stamps = [
+        str(int(stats[key].timestamp() * 1_000_000)) if stats[key] else "0"
+        for key in ("last_added", "last_item_change")
+    ]
+    return f'"cart-{user.id}-{stats["count"]}-{"-".join(stamps)}"'
+
+
 @csrf_exempt
 def populate_demo_data(request):
     if request.method == "OPTIONS":
-        return _with_cors(request, HttpResponse(status=204))
+        return with_cors(request, HttpResponse(status=204))
 
     if request.method != "POST":
-        return _with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
+        return with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
 
     User = get_user_model()
 
@@ -84,6 +117,7 @@ def populate_demo_data(request):
                 )
 
         Item.objects.bulk_create(items_to_create)
+        aggregates.rebuild_all()
 
     payload = {
         "message": "Database populated with 6 users (3 sellers) and 30 items.",
@@ -91,13 +125,15 @@ def populate_demo_data(request):
         "sellers_with_items": 3,
         "items_created": 30,
     }
-    return _with_cors(request, JsonResponse(payload, status=201))
+    return with_cors(request, JsonResponse(payload, status=201))
 
 
 @csrf_exempt
+@replica_reads
+@idempotent("list_items")
 def list_items(request):
     if request.method == "OPTIONS":
-        return _with_cors(request, HttpResponse(status=204))
+        return with_cors(request, HttpResponse(status=204))
 
     if request.method == "GET":
         items = Item.objects.select_related("owner", "buyer").all()
@@ -108,43 +144,58 @@ def list_items(request):
 
         if request.GET.get("mine"):
             if not request.user.is_authenticated:
-                return _with_cors(request, JsonResponse({"message": "Authentication required"}, status=401))
+                return with_cors(request, JsonResponse({"message": "Authentication required"}, status=401))
             items = items.filter(owner=request.user)
-        else:
-            items = items.filter(status=STATUS_AVAILABLE)
+            payload = [_serialize_item(item) for item in items]
+            return with_cors(request, JsonResponse(payload, safe=False))
 
-        payload = [_serialize_item(item) for item in items]
-        return _with_cors(request, JsonResponse(payload, safe=False))
+        cache_key = listing_cache_key(search_term)
+        variants = get_cached_listing(cache_key)
+        if variants is None:
+            items = items.filter(status=STATUS_AVAILABLE)
+            payload = [_serialize_item(item) for item in items]
+            body = JsonResponse(payload, safe=False).content
+            if replica_reads_active():
+                # A lagging replica must not fill the cache other sessions read from.
+                variants = {"identity": body}
+            else:
+                variants = cache_listing(cache_key, body)
+
+        response = HttpResponse(variants["identity"], content_type="application/json")
+        response.precompressed = variants
+        return with_cors(request, response)
 
     if request.method == "POST":
         if not request.user.is_authenticated:
-            return _with_cors(request, JsonResponse({"message": "Authentication required"}, status=401))
+            return with_cors(request, JsonResponse({"message": "Authentication required"}, status=401))
 
         try:
             data = json.loads(request.body.decode("utf-8"))
         except Exception:
-            return _with_cors(request, JsonResponse({"message": "Invalid JSON body"}, status=400))
+            return with_cors(request, JsonResponse({"message": "Invalid JSON body"}, status=400))
 
         title = (data.get("title") or "").strip()
         description = (data.get("description") or "").strip()
         price_raw = data.get("price")
 
         if not title or price_raw is None:
-            return _with_cors(
+            return with_cors(
                 request, JsonResponse({"message": "title and price are required"}, status=400)
             )
 
         try:
             price = Decimal(str(price_raw))
         except Exception:
-            return _with_cors(request, JsonResponse({"message": "price must be a number"}, status=400))
-
-        item = Item.objects.create(
-            owner=request.user,
-            name=title,
-            description=description,
-            price=price,
-        )
+            return with_cors(request, JsonResponse({"message": "price must be a number"}, status=400))
+
+        with transaction.atomic():
+            item = Item.objects.create(
+                owner=request.user,
+                name=title,
+                description=description,
+                price=price,
+            )
+            aggregates.record_items_listed(request.user.id, 1)
 
         payload = {
             "message": "Item created",
@@ -157,46 +208,213 @@ def list_items(request):
                 "owner": item.owner.username,
             },
         }
-        return _with_cors(request, JsonResponse(payload, status=201))
+        return with_cors(request, JsonResponse(payload, status=201))
+
+    return with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
+
+
+@csrf_exempt
+def import_items_view(request):
+    if request.method == "OPTIONS":
+        return with_cors(request, HttpResponse(status=204))
+
+    if request.method != "POST":
+        return with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
+
+    if not request.user.is_authenticated:
+        return with_cors(request, JsonResponse({"message": "Authentication required"}, status=401))
+
+    # Imported here so workers that never serve an import skip loading csv/codecs.
+    from .bulk_import import IMPORT_FORMATS, import_items
+
+    fmt = request.GET.get("format")
+    if not fmt:
+        content_type = request.content_type or ""
+        fmt = "csv" if content_type == "text/csv" else "ndjson"
+    if fmt not in IMPORT_FORMATS:
+        return with_cors(
+            request, JsonResponse({"message": "format must be one of: csv, ndjson"}, status=400)
+        )
+
+    # Iterating the request reads the upload line by line instead of buffering it.
+    report = import_items(request.user, request, fmt)
+
+    payload = {"message": "Import finished", **report}
+    return with_cors(request, JsonResponse(payload, status=200))
+
+
+MAX_BULK_ITEMS = 1000
+
+
+def _classify_owned_items(user, item_ids: list[int]) -> tuple[dict[int, Item], dict[int, str]]:
+    """Split ``item_ids`` into the user's editable items and per-id failures."""
+    items = {
+        item.id: item
+        for item in Item.objects.filter(id__in=item_ids)
+        .select_for_update()
+        .only("id", "owner_id", "status", "price")
+    }
+    editable: dict[int, Item] = {}
+    failures: dict[int, str] = {}
+    for item_id in item_ids:
+        item = items.get(item_id)
+        if item is None:
+            failures[item_id] = "not_found"
+        elif item.owner_id != user.id:
+            failures[item_id] = "forbidden"
+        elif item.status != STATUS_AVAILABLE:
+            failures[item_id] = "not_available"
+        else:
+            editable[item_id] = item
+    return editable, failures
+
+
+@csrf_exempt
+def bulk_items(request):
+    if request.method == "OPTIONS":
+        return with_cors(request, HttpResponse(status=204))
+
+    if request.method not in {"PATCH", "DELETE"}:
+        return with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
+
+    if not request.user.is_authenticated:
+        return with_cors(request, JsonResponse({"message": "Authentication required"}, status=401))
+
+    try:
+        data = json.loads(request.body.decode("utf-8"))
+    except Exception:
+        return with_cors(request, JsonResponse({"message": "Invalid JSON body"}, status=400))
+
+    if request.method == "PATCH":
+        updates = data.get("items")
+        if not isinstance(updates, list) or not updates:
+            return with_cors(request, JsonResponse({"message": "items is required"}, status=400))
+        if len(updates) > MAX_BULK_ITEMS:
+            return with_cors(
+                request, JsonResponse({"message": f"At most {MAX_BULK_ITEMS} items per request"}, status=400)
+            )
+
+        item_ids: list[int] = []
+        results: dict[int, str] = {}
+        new_prices: dict[int, Decimal] = {}
+        price_field = Item._meta.get_field("price")
+        for update in updates:
+            try:
+                item_id = int(update.get("id"))
+            except Exception:
+                return with_cors(request, JsonResponse({"message": "Every item needs an id"}, status=400))
+            item_ids.append(item_id)
+            try:
+                new_prices[item_id] = price_field.clean(str(update.get("price")), None)
+                results.pop(item_id, None)
+            except Exception:
+                new_prices.pop(item_id, None)
+                results[item_id] = "invalid_price"
+
+        with transaction.atomic():
+            editable, failures = _classify_owned_items(request.user, list(new_prices))
+            now = timezone.now()
+            for item_id, item in editable.items():
+                item.price = new_prices[item_id]
+                item.updated_at = now
+            Item.objects.bulk_update(editable.values(), ["price", "updated_at"])
+            aggregates.refresh_carts(aggregates.cart_users_holding(editable))
+        if editable:
+            bump_catalogue_version()
+
+        results.update(failures)
+        results.update({item_id: "updated" for item_id in editable})
+        payload = {
+            "message": "Prices updated",
+            "updated": len(editable),
+            "results": [{"id": item_id, "status": results[item_id]} for item_id in dict.fromkeys(item_ids)],
+        }
+        return with_cors(request, JsonResponse(payload, status=200))
+
+    ids = data.get("ids")
+    if not isinstance(ids, list) or not ids:
+        return with_cors(request, JsonResponse({"message": "ids is required"}, status=400))
+    if len(ids) > MAX_BULK_ITEMS:
+        return with_cors(
+            request, JsonResponse({"message": f"At most {MAX_BULK_ITEMS} items per request"}, status=400)
+        )
+    try:
+        item_ids = list(dict.fromkeys(int(item_id) for item_id in ids))
+    except Exception:
+        return with_cors(request, JsonResponse({"message": "ids must be integers"}, status=400))
 
-    return _with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
+    with transaction.atomic():
+        editable, failures = _classify_owned_items(request.user, item_ids)
+        if editable:
+            cart_users = aggregates.cart_users_holding(editable)
+            aggregates.record_items_removed(editable.values())
+            Item.objects.filter(id__in=list(editable)).delete()
+            aggregates.refresh_carts(cart_users)
+            bump_catalogue_version()
+
+    results = {**failures, **{item_id: "deleted" for item_id in editable}}
+    payload = {
+        "message": "Items deleted",
+        "deleted": len(editable),
+        "results": [{"id": item_id, "status": results[item_id]} for item_id in item_ids],
+    }
+    return with_cors(request, JsonResponse(payload, status=200))
 
 
 @csrf_exempt
+@replica_reads
 def item_detail(request, item_id: int):
     if request.method == "OPTIONS":
-        return _with_cors(request, HttpResponse(status=204))
+        return with_cors(request, HttpResponse(status=204))
+
+    if request.method in {"GET", "HEAD"}:
+        row = Item.objects.filter(pk=item_id).values_list("updated_at", "status", "owner_id", "buyer_id").first()
+        if row is None:
+            return with_cors(request, JsonResponse({"message": "Not found"}, status=404))
+        updated_at, status, owner_id, buyer_id = row
+        # Like the public listing, sold items are only visible to their seller and buyer.
+        if status != STATUS_AVAILABLE and request.user.id not in {owner_id, buyer_id}:
+            return with_cors(request, JsonResponse({"message": "Not found"}, status=404))
+
+        def build_response():
+            item = Item.objects.select_related("owner", "buyer").get(pk=item_id)
+            return JsonResponse(_serialize_item(item))
+
+        etag = f'"item-{item_id}-{int(updated_at.timestamp() * 1_000_000)}"'
+        return with_cors(request, _conditional(request, etag, updated_at, build_response))
 
     try:
         item = Item.objects.get(pk=item_id)
     except Item.DoesNotExist:
-        return _with_cors(request, JsonResponse({"message": "Not found"}, status=404))
+        return with_cors(request, JsonResponse({"message": "Not found"}, status=404))
 
     if request.method in {"PATCH", "PUT"}:
         if not request.user.is_authenticated:
-            return _with_cors(request, JsonResponse({"message": "Authentication required"}, status=401))
+            return with_cors(request, JsonResponse({"message": "Authentication required"}, status=401))
         if item.owner_id != request.user.id:
-            return _with_cors(request, JsonResponse({"message": "Forbidden"}, status=403))
+            return with_cors(request, JsonResponse({"message": "Forbidden"}, status=403))
         if item.status != STATUS_AVAILABLE:
-            return _with_cors(request, JsonResponse({"message": "Item is not available for editing"}, status=400))
+            return with_cors(request, JsonResponse({"message": "Item is not available for editing"}, status=400))
 
         try:
             data = json.loads(request.body.decode("utf-8"))
         except Exception:
-            return _with_cors(request, JsonResponse({"message": "Invalid JSON body"}, status=400))
+            return with_cors(request, JsonResponse({"message": "Invalid JSON body"}, status=400))
 
         if "price" not in data:
-            return _with_cors(request, JsonResponse({"message": "price is required"}, status=400))
+            return with_cors(request, JsonResponse({"message": "price is required"}, status=400))
 
         try:
             new_price = Decimal(str(data.get("price")))
         except Exception:
-            return _with_cors(request, JsonResponse({"message": "price must be a number"}, status=400))
+            return with_cors(request, JsonResponse({"message": "price must be a number"}, status=400))
 
-        item.price = new_price
-        item.save(update_fields=["price"])
+        with transaction.atomic():
+            item.price = new_price
+            item.save(update_fields=["price", "updated_at"])
+            aggregates.refresh_carts(aggregates.cart_users_holding([item.id]))
 
-        return _with_cors(
+        return with_cors(
             request,
             JsonResponse(
                 {
@@ -209,66 +427,85 @@ def item_detail(request, item_id: int):
 
     if request.method == "DELETE":
         if not request.user.is_authenticated:
-            return _with_cors(request, JsonResponse({"message": "Authentication required"}, status=401))
+            return with_cors(request, JsonResponse({"message": "Authentication required"}, status=401))
         if item.owner_id != request.user.id:
-            return _with_cors(request, JsonResponse({"message": "Forbidden"}, status=403))
-        item.delete()
-        return _with_cors(request, JsonResponse({"message": "Item deleted"}, status=200))
+            return with_cors(request, JsonResponse({"message": "Forbidden"}, status=403))
+        with transaction.atomic():
+            # Re-read under lock: a concurrent checkout may have sold the item since.
+            item = Item.objects.select_for_update().filter(pk=item.pk).first()
+            if item is None:
+                return with_cors(request, JsonResponse({"message": "Not found"}, status=404))
+            cart_users = aggregates.cart_users_holding([item.id])
+            aggregates.record_items_removed([item])
+            item.delete()
+            aggregates.refresh_carts(cart_users)
+        return with_cors(request, JsonResponse({"message": "Item deleted"}, status=200))
 
-    return _with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
+    return with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
 
 
 @csrf_exempt
+@replica_reads
 def cart_view(request):
     if request.method == "OPTIONS":
-        return _with_cors(request, HttpResponse(status=204))
+        return with_cors(request, HttpResponse(status=204))
 
     if not request.user.is_authenticated:
-        return _with_cors(request, JsonResponse({"message": "Authentication required"}, status=401))
+        return with_cors(request, JsonResponse({"message": "Authentication required"}, status=401))
 
     if request.method == "GET":
-        entries = (
-            CartItem.objects.select_related("item", "item__owner")
-            .filter(user=request.user)
-            .order_by("-created_at")
-        )
-        payload = [
-            {
-                "id": entry.id,
-                "item_id": entry.item.id,
-                "title": entry.item.name,
-                "description": entry.item.description,
-                "price": str(entry.item.price),
-                "date_added": entry.item.created_at.isoformat(),
-                "seller": entry.item.owner.username,
-                "added_at": entry.created_at.isoformat(),
-            }
-            for entry in entries
-        ]
-        return _with_cors(request, JsonResponse(payload, safe=False))
+        def build_response():
+            entries = (
+                CartItem.objects.select_related("item", "item__owner")
+                .filter(user=request.user)
+                .order_by("-created_at")
+            )
+            payload = [
+                {
+                    "id": entry.id,
+                    "item_id": entry.item.id,
+                    "title": entry.item.name,
+                    "description": entry.item.description,
+                    "price": str(entry.item.price),
+                    "date_added": entry.item.created_at.isoformat(),
+                    "seller": entry.item.owner.username,
+                    "added_at": entry.created_at.isoformat(),
+                }
+                for entry in entries
+            ]
+            return JsonResponse(payload, safe=False)
+
+        # ETag only: removing an entry can make the cart older, which
+        # If-Modified-Since could not detect.
+        return with_cors(request, _conditional(request, _cart_version(request.user), None, build_response))
 
     if request.method == "POST":
         try:
             data = json.loads(request.body.decode("utf-8"))
         except Exception:
-            return _with_cors(request, JsonResponse({"message": "Invalid JSON body"}, status=400))
+            return with_cors(request, JsonResponse({"message": "Invalid JSON body"}, status=400))
 
         item_id = data.get("item_id")
         if not item_id:
-            return _with_cors(request, JsonResponse({"message": "item_id is required"}, status=400))
+            return with_cors(request, JsonResponse({"message": "item_id is required"}, status=400))
 
-        try:
-            item = Item.objects.select_related("owner").get(pk=item_id)
-        except Item.DoesNotExist:
-            return _with_cors(request, JsonResponse({"message": "Item not found"}, status=404))
+        with transaction.atomic():
+            # Lock the item so the price added to the summary is the one
+            # committed; a reprice waiting on the lock refreshes this cart after us.
+            try:
+                item = Item.objects.select_related("owner").select_for_update(of=("self",)).get(pk=item_id)
+            except Item.DoesNotExist:
+                return with_cors(request, JsonResponse({"message": "Item not found"}, status=404))
 
-        if item.status != STATUS_AVAILABLE:
-            return _with_cors(request, JsonResponse({"message": "Item is no longer available"}, status=400))
+            if item.status != STATUS_AVAILABLE:
+                return with_cors(request, JsonResponse({"message": "Item is no longer available"}, status=400))
 
-        if item.owner_id == request.user.id:
-            return _with_cors(request, JsonResponse({"message": "Cannot add your own item"}, status=400))
+            if item.owner_id == request.user.id:
+                return with_cors(request, JsonResponse({"message": "Cannot add your own item"}, status=400))
 
-        cart_entry, created = CartItem.objects.get_or_create(user=request.user, item=item)
+            cart_entry, created = CartItem.objects.get_or_create(user=request.user, item=item)
+            if created:
+                aggregates.record_cart_change(request.user.id, 1, item.price)
         payload = {
             "message": "Added to cart" if created else "Already in cart",
             "cart_item": {
@@ -279,46 +516,55 @@ def cart_view(request):
                 "seller": item.owner.username,
             },
         }
-        return _with_cors(request, JsonResponse(payload, status=201 if created else 200))
+        return with_cors(request, JsonResponse(payload, status=201 if created else 200))
 
-    return _with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
+    return with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
 
 
 @csrf_exempt
 def cart_item_detail(request, cart_item_id: int):
     if request.method == "OPTIONS":
-        return _with_cors(request, HttpResponse(status=204))
+        return with_cors(request, HttpResponse(status=204))
 
     if not request.user.is_authenticated:
-        return _with_cors(request, JsonResponse({"message": "Authentication required"}, status=401))
+        return with_cors(request, JsonResponse({"message": "Authentication required"}, status=401))
 
     try:
-        entry = CartItem.objects.select_related("item").get(pk=cart_item_id, user=request.user)
+        entry = CartItem.objects.get(pk=cart_item_id, user=request.user)
     except CartItem.DoesNotExist:
-        return _with_cors(request, JsonResponse({"message": "Not found"}, status=404))
+        return with_cors(request, JsonResponse({"message": "Not found"}, status=404))
 
     if request.method == "DELETE":
-        entry.delete()
-        return _with_cors(request, JsonResponse({"message": "Removed from cart"}, status=200))
+        with transaction.atomic():
+            # Read the price under lock: a reprice since the entry was loaded
+            # has already refreshed the summary with the new one.
+            price = Item.objects.select_for_update().filter(pk=entry.item_id).values_list("price", flat=True).first()
+            deleted, _ = entry.delete()
+            # A concurrent remove of the same entry already adjusted the summary.
+            if deleted:
+                aggregates.record_cart_change(request.user.id, -1, -price)
+        return with_cors(request, JsonResponse({"message": "Removed from cart"}, status=200))
 
-    return _with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
+    return with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
 
 
 @csrf_exempt
+@idempotent("cart_pay")
+@rate_limit("checkout", per_user="5/m", global_rate="50/s")
 def cart_pay(request):
     if request.method == "OPTIONS":
-        return _with_cors(request, HttpResponse(status=204))
+        return with_cors(request, HttpResponse(status=204))
 
     if not request.user.is_authenticated:
-        return _with_cors(request, JsonResponse({"message": "Authentication required"}, status=401))
+        return with_cors(request, JsonResponse({"message": "Authentication required"}, status=401))
 
     if request.method != "POST":
-        return _with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
+        return with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
 
     try:
         data = json.loads(request.body.decode("utf-8")) if request.body else {}
     except Exception:
-        return _with_cors(request, JsonResponse({"message": "Invalid JSON body"}, status=400))
+        return with_cors(request, JsonResponse({"message": "Invalid JSON body"}, status=400))
 
     expected_prices: dict[int, Decimal] = {}
     for entry in data.get("items", []):
@@ -341,7 +587,7 @@ def cart_pay(request):
         )
 
         if not cart_entries.exists():
-            return _with_cors(request, JsonResponse({"message": "Your cart is empty."}, status=400))
+            return with_cors(request, JsonResponse({"message": "Your cart is empty."}, status=400))
 
         price_changes: list[dict] = []
         unavailable_items: list[dict] = []
@@ -373,7 +619,7 @@ def cart_pay(request):
                 )
 
         if price_changes or unavailable_items:
-            return _with_cors(
+            return with_cors(
                 request,
                 JsonResponse(
                     {
@@ -386,6 +632,7 @@ def cart_pay(request):
             )
 
         purchased_items: list[dict] = []
+        sold_items: list[Item] = []
         cart_entry_ids: list[int] = []
 
         for entry in cart_entries:
@@ -404,13 +651,14 @@ def cart_pay(request):
 
             item.status = STATUS_SOLD
             item.buyer = request.user
-            item.save(update_fields=["status", "buyer"])
+            item.save(update_fields=["status", "buyer", "updated_at"])
 
             purchased_items.append(_serialize_item(item))
+            sold_items.append(item)
             cart_entry_ids.append(entry.id)
 
         if unavailable_items:
-            return _with_cors(
+            return with_cors(
                 request,
                 JsonResponse(
                     {
@@ -423,40 +671,45 @@ def cart_pay(request):
 
         if cart_entry_ids:
             CartItem.objects.filter(id__in=cart_entry_ids).delete()
+            aggregates.record_sale(sold_items)
+            aggregates.record_cart_change(
+                request.user.id, -len(sold_items), -sum((item.price for item in sold_items), Decimal("0"))
+            )
 
     payload = {
         "message": "Payment completed successfully.",
         "purchased": purchased_items,
         "cleared_cart_item_ids": cart_entry_ids,
     }
-    return _with_cors(request, JsonResponse(payload, status=200))
+    return with_cors(request, JsonResponse(payload, status=200))
 
 
 @csrf_exempt
+@rate_limit("signup", per_ip="5/m", global_rate="10/s")
 def signup(request):
     if request.method == "OPTIONS":
-        return _with_cors(request, HttpResponse(status=204))
+        return with_cors(request, HttpResponse(status=204))
 
     if request.method != "POST":
-        return _with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
+        return with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
 
     try:
         data = json.loads(request.body.decode("utf-8"))
     except Exception:
-        return _with_cors(request, JsonResponse({"message": "Invalid JSON body"}, status=400))
+        return with_cors(request, JsonResponse({"message": "Invalid JSON body"}, status=400))
 
     username = (data.get("username") or "").strip()
     email = (data.get("email") or "").strip()
     password = data.get("password") or ""
 
     if not username or not email or not password:
-        return _with_cors(
+        return with_cors(
             request, JsonResponse({"message": "username, email, and password are required"}, status=400)
         )
 
     User = get_user_model()
     if User.objects.filter(username=username).exists():
-        return _with_cors(request, JsonResponse({"message": "Username already taken"}, status=400))
+        return with_cors(request, JsonResponse({"message": "Username already taken"}, status=400))
 
     user = User.objects.create_user(username=username, email=email, password=password)
 
@@ -464,31 +717,32 @@ def signup(request):
         "message": "Account created successfully",
         "user": {"id": user.id, "username": user.username, "email": user.email},
     }
-    return _with_cors(request, JsonResponse(payload, status=201))
+    return with_cors(request, JsonResponse(payload, status=201))
 
 
 @csrf_exempt
+@rate_limit("login", per_ip="10/m", global_rate="20/s")
 def login_view(request):
     if request.method == "OPTIONS":
-        return _with_cors(request, HttpResponse(status=204))
+        return with_cors(request, HttpResponse(status=204))
 
     if request.method != "POST":
-        return _with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
+        return with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
 
     try:
         data = json.loads(request.body.decode("utf-8"))
     except Exception:
-        return _with_cors(request, JsonResponse({"message": "Invalid JSON body"}, status=400))
+        return with_cors(request, JsonResponse({"message": "Invalid JSON body"}, status=400))
 
     username = (data.get("username") or "").strip()
     password = data.get("password") or ""
 
     if not username or not password:
-        return _with_cors(request, JsonResponse({"message": "username and password are required"}, status=400))
+        return with_cors(request, JsonResponse({"message": "username and password are required"}, status=400))
 
     user = authenticate(request, username=username, password=password)
     if user is None:
-        return _with_cors(request, JsonResponse({"message": "Invalid credentials"}, status=401))
+        return with_cors(request, JsonResponse({"message": "Invalid credentials"}, status=401))
 
     login(request, user)
 
@@ -496,18 +750,18 @@ def login_view(request):
         "message": "Logged in successfully",
         "user": {"id": user.id, "username": user.username, "email": user.email},
     }
-    return _with_cors(request, JsonResponse(payload, status=200))
+    return with_cors(request, JsonResponse(payload, status=200))
 
 
 def me(request):
     if request.method == "OPTIONS":
-        return _with_cors(request, HttpResponse(status=204))
+        return with_cors(request, HttpResponse(status=204))
 
     if request.method != "GET":
-        return _with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
+        return with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
 
     if not request.user.is_authenticated:
-        return _with_cors(request, JsonResponse({"authenticated": False}, status=200))
+        return with_cors(request, JsonResponse({"authenticated": False}, status=200))
 
     payload = {
         "authenticated": True,
@@ -517,63 +771,64 @@ def me(request):
             "email": request.user.email,
         },
     }
-    return _with_cors(request, JsonResponse(payload, status=200))
+    return with_cors(request, JsonResponse(payload, status=200))
 
 
 @csrf_exempt
 def logout_view(request):
     if request.method == "OPTIONS":
-        return _with_cors(request, HttpResponse(status=204))
+        return with_cors(request, HttpResponse(status=204))
 
     if request.method != "POST":
-        return _with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
+        return with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
 
     logout(request)
-    return _with_cors(request, JsonResponse({"message": "Logged out"}, status=200))
+    return with_cors(request, JsonResponse({"message": "Logged out"}, status=200))
 
 
 @csrf_exempt
 def change_password(request):
     if request.method == "OPTIONS":
-        return _with_cors(request, HttpResponse(status=204))
+        return with_cors(request, HttpResponse(status=204))
 
     if request.method != "POST":
-        return _with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
+        return with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
 
     if not request.user.is_authenticated:
-        return _with_cors(request, JsonResponse({"message": "Authentication required"}, status=401))
+        return with_cors(request, JsonResponse({"message": "Authentication required"}, status=401))
 
     try:
         data = json.loads(request.body.decode("utf-8"))
     except Exception:
-        return _with_cors(request, JsonResponse({"message": "Invalid JSON body"}, status=400))
+        return with_cors(request, JsonResponse({"message": "Invalid JSON body"}, status=400))
 
     old_password = data.get("old_password") or ""
     new_password = data.get("new_password") or ""
 
     if not old_password or not new_password:
-        return _with_cors(request, JsonResponse({"message": "old_password and new_password are required"}, status=400))
+        return with_cors(request, JsonResponse({"message": "old_password and new_password are required"}, status=400))
 
     if not request.user.check_password(old_password):
-        return _with_cors(request, JsonResponse({"message": "Old password is incorrect"}, status=400))
+        return with_cors(request, JsonResponse({"message": "Old password is incorrect"}, status=400))
 
     request.user.set_password(new_password)
     request.user.save()
     login(request, request.user)
 
-    return _with_cors(request, JsonResponse({"message": "Password updated successfully"}, status=200))
+    return with_cors(request, JsonResponse({"message": "Password updated successfully"}, status=200))
 
 
 @csrf_exempt
+@replica_reads
 def inventory_view(request):
     if request.method == "OPTIONS":
-        return _with_cors(request, HttpResponse(status=204))
+        return with_cors(request, HttpResponse(status=204))
 
     if request.method != "GET":
-        return _with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
+        return with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
 
     if not request.user.is_authenticated:
-        return _with_cors(request, JsonResponse({"message": "Authentication required"}, status=401))
+        return with_cors(request, JsonResponse({"message": "Authentication required"}, status=401))
 
     base_query = Item.objects.select_related("owner", "buyer")
     on_sale = base_query.filter(owner=request.user, status=STATUS_AVAILABLE)
@@ -586,4 +841,42 @@ def inventory_view(request):
         "purchased": [_serialize_item(item) for item in purchased],
     }
 
-    return _with_cors(request, JsonResponse(payload, status=200))
+    return with_cors(request, JsonResponse(payload, status=200))
+
+
+@csrf_exempt
+@replica_reads
+def stats_view(request):
+    if request.method == "OPTIONS":
+        return with_cors(request, HttpResponse(status=204))
+
+    if request.method != "GET":
+        return with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
+
+    if not request.user.is_authenticated:
+        return with_cors(request, JsonResponse({"message": "Authentication required"}, status=401))
+
+    stats = aggregates.get_seller_stats(request.user.id)
+    payload = {
+        "items_on_sale": stats.items_on_sale,
+        "units_sold": stats.units_sold,
+        "revenue": str(stats.revenue),
+    }
+    return with_cors(request, JsonResponse(payload, status=200))
+
+
+@csrf_exempt
+@replica_reads
+def cart_summary(request):
+    if request.method == "OPTIONS":
+        return with_cors(request, HttpResponse(status=204))
+
+    if request.method != "GET":
+        return with_cors(request, JsonResponse({"message": "Method not allowed"}, status=405))
+
+    if not request.user.is_authenticated:
+        return with_cors(request, JsonResponse({"message": "Authentication required"}, status=401))
+
+    summary = aggregates.get_cart_summary(request.user.id)
+    payload = {"item_count": summary.item_count, "total": str(summary.total)}
+    return with_cors(request, JsonResponse(payload, status=200))